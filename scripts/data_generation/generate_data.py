@@ -1,10 +1,15 @@
 import os
 import json
-import random
+import argparse
+import shutil
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from faker import Faker
 import yaml
 
@@ -15,169 +20,533 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 
 CONFIG_PATH = os.path.join(BASE_DIR, "config", "config.yaml")
 DATA_RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
+CACHE_DIR = os.path.join(BASE_DIR, "data", "cache")
 
 os.makedirs(DATA_RAW_DIR, exist_ok=True)
 
 with open(CONFIG_PATH, "r") as f:
     config = yaml.safe_load(f)
 
-fake = Faker()
-random.seed(42)
-Faker.seed(42)
+SEED = 42
+
+# Independent random streams derived per shard in --workers mode
+COUNT_STREAM, VALUE_STREAM = 0, 1
+# Spawn-key prefix for delta batches, kept apart from the shard indexes
+DELTA_STREAM = 1_000_000
+
+np_rng = None
+pool_seed = None
+
+
+def seed_generators(seed):
+    global np_rng, pool_seed
+    np_rng = np.random.default_rng(seed)
+    pool_seed = seed
+
+
+seed_generators(SEED)
 
 # --------------------------------------------------
 # Helper functions
 # --------------------------------------------------
-def generate_id(prefix, number, pad):
-    return f"{prefix}{str(number).zfill(pad)}"
+def format_ids(prefix, numbers, pad):
+    return (prefix + pd.Series(numbers).astype(str).str.zfill(pad)).to_numpy()
 
 
-def random_date(start_date, end_date):
-    delta = end_date - start_date
-    return start_date + timedelta(days=random.randint(0, delta.days))
+def generate_ids(prefix, start, count, pad):
+    return format_ids(prefix, np.arange(start, start + count), pad)
 
 
 # --------------------------------------------------
-# Generate Customers
+# Faker value pools
 # --------------------------------------------------
-def generate_customers():
-    customers = []
-    used_emails = set()
+FAKER_POOLS = {
+    "first_names": lambda f: f.first_name(),
+    "last_names": lambda f: f.last_name(),
+    "phones": lambda f: f.phone_number(),
+    "cities": lambda f: f.city(),
+    "states": lambda f: f.state(),
+    "countries": lambda f: f.country(),
+    "addresses": lambda f: f.address().replace("\n", ", "),
+    "companies": lambda f: f.company(),
+    "words": lambda f: f.word().title(),
+    "email_domains": lambda f: f.safe_domain_name(),
+}
+
+_pool_memo = {}
+
+
+def build_faker_pools(seed, locale, size):
+    fake = Faker(locale)
+    fake.seed_instance(seed)
+    return {name: [draw(fake) for _ in range(size)] for name, draw in FAKER_POOLS.items()}
+
+
+def load_faker_pools(seed=None, locale=None, size=None):
+    """Faker is only called while building the pools, which are cached on disk"""
+    gen = config["data_generation"]
+    seed = pool_seed if seed is None else seed
+    locale = locale or gen.get("faker_locale", "en_US")
+    size = size or gen.get("faker_pool_size", 5000)
+
+    key = (seed, locale, size)
+    if key in _pool_memo:
+        return _pool_memo[key]
+
+    cache_path = os.path.join(CACHE_DIR, f"faker_pools_{locale}_{seed}_{size}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            pools = json.load(f)
+    else:
+        pools = build_faker_pools(seed, locale, size)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(pools, f)
+        os.replace(cache_path + ".tmp", cache_path)
+
+    _pool_memo[key] = {name: np.asarray(values, dtype=object) for name, values in pools.items()}
+    return _pool_memo[key]
+
+
+def sample_pool(pools, name, count, rng):
+    pool = pools[name]
+    return pool[rng.integers(0, len(pool), count)]
 
-    age_groups = ["18-25", "26-35", "36-45", "46-60", "60+"]
 
-    for i in range(1, config["data_generation"]["customers"] + 1):
-        email = fake.email()
-        while email in used_emails:
-            email = fake.email()
-        used_emails.add(email)
+# --------------------------------------------------
+# Generate Customers
+# --------------------------------------------------
+AGE_GROUPS = ["18-25", "26-35", "36-45", "46-60", "60+"]
+
+
+def build_emails(first_names, last_names, numbers, domains):
+    # The customer number makes every address unique, so no retry loop is needed
+    local = (
+        pd.Series(first_names) + "." + pd.Series(last_names) + pd.Series(numbers).astype(str)
+    ).str.lower().str.replace(r"[^a-z0-9.]", "", regex=True)
+    return (local + "@" + pd.Series(domains)).to_numpy()
+
+
+def generate_customers(rng=None, pools=None, count=None, start=1):
+    rng = rng if rng is not None else np_rng
+    pools = pools or load_faker_pools()
+    n = config["data_generation"]["customers"] if count is None else count
+
+    first_names = sample_pool(pools, "first_names", n, rng)
+    last_names = sample_pool(pools, "last_names", n, rng)
+    registration_offsets = rng.integers(0, 3 * 365 + 1, n).astype("timedelta64[D]")
+
+    return pd.DataFrame({
+        "customer_id": generate_ids("CUST", start, n, 4),
+        "first_name": first_names,
+        "last_name": last_names,
+        "email": build_emails(
+            first_names, last_names, np.arange(start, start + n),
+            sample_pool(pools, "email_domains", n, rng)
+        ),
+        "phone": sample_pool(pools, "phones", n, rng),
+        "registration_date": (np.datetime64("today", "D") - registration_offsets).astype(str),
+        "city": sample_pool(pools, "cities", n, rng),
+        "state": sample_pool(pools, "states", n, rng),
+        "country": sample_pool(pools, "countries", n, rng),
+        "age_group": np.asarray(AGE_GROUPS)[rng.integers(0, len(AGE_GROUPS), n)]
+    })
 
-        customers.append({
-            "customer_id": generate_id("CUST", i, 4),
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "email": email,
-            "phone": fake.phone_number(),
-            "registration_date": fake.date_between(start_date="-3y", end_date="today"),
-            "city": fake.city(),
-            "state": fake.state(),
-            "country": fake.country(),
-            "age_group": random.choice(age_groups)
-        })
 
-    return pd.DataFrame(customers)
+# --------------------------------------------------
+# Generate Products
+# --------------------------------------------------
+CATEGORIES = {
+    "Electronics": (500, 50000),
+    "Clothing": (500, 5000),
+    "Home & Kitchen": (800, 15000),
+    "Books": (200, 2000),
+    "Sports": (700, 12000),
+    "Beauty": (300, 8000)
+}
+
+
+def generate_products(rng=None, pools=None, count=None, start=1):
+    rng = rng if rng is not None else np_rng
+    pools = pools or load_faker_pools()
+    n = config["data_generation"]["products"] if count is None else count
+
+    names = np.asarray(list(CATEGORIES))
+    bounds = np.asarray(list(CATEGORIES.values()), dtype=float)
+    category_idx = rng.integers(0, len(names), n)
+    min_price, max_price = bounds[category_idx, 0], bounds[category_idx, 1]
+
+    price = np.round(rng.uniform(min_price, max_price), 2)
+    cost = np.round(price * rng.uniform(0.5, 0.85, n), 2)
+
+    return pd.DataFrame({
+        "product_id": generate_ids("PROD", start, n, 4),
+        "product_name": sample_pool(pools, "words", n, rng),
+        "category": names[category_idx],
+        "sub_category": sample_pool(pools, "words", n, rng),
+        "price": price,
+        "cost": cost,
+        "brand": sample_pool(pools, "companies", n, rng),
+        "stock_quantity": rng.integers(10, 1001, n),
+        "supplier_id": format_ids("SUP", rng.integers(1, 51, n), 3)
+    })
 
 
 # --------------------------------------------------
-# Generate Products
+# Generate Transactions & Transaction Items
 # --------------------------------------------------
-def generate_products():
-    categories = {
-        "Electronics": (500, 50000),
-        "Clothing": (500, 5000),
-        "Home & Kitchen": (800, 15000),
-        "Books": (200, 2000),
-        "Sports": (700, 12000),
-        "Beauty": (300, 8000)
-    }
+PAYMENT_METHODS = [
+    "Credit Card", "Debit Card", "UPI",
+    "Cash on Delivery", "Net Banking"
+]
+
+DISCOUNTS = [0, 5, 10, 15]
+
+TRANSACTION_COLUMNS = [
+    "transaction_id", "customer_id", "transaction_date", "transaction_time",
+    "payment_method", "shipping_address", "total_amount"
+]
+
+ITEM_COLUMNS = [
+    "item_id", "transaction_id", "product_id", "quantity",
+    "unit_price", "discount_percentage", "line_total"
+]
 
-    products = []
 
-    for i in range(1, config["data_generation"]["products"] + 1):
-        category = random.choice(list(categories.keys()))
-        min_price, max_price = categories[category]
+def draw_item_counts(rng, num_transactions):
+    gen = config["data_generation"]
+    return rng.integers(
+        gen["min_items_per_txn"], gen["max_items_per_txn"] + 1, num_transactions
+    )
+
+
+def generate_transaction_batch(customers_df, products_df, num_transactions,
+                               txn_start=1, item_start=1, rng=None, count_rng=None,
+                               pools=None):
+    """Vectorized generation: every attribute is drawn for the whole batch at once"""
+    gen = config["data_generation"]
+    rng = rng if rng is not None else np_rng
+    pools = pools or load_faker_pools()
+    count_rng = count_rng if count_rng is not None else rng
+
+    start_date = np.datetime64(gen["start_date"], "D")
+    end_date = np.datetime64(gen["end_date"], "D")
+    num_days = int((end_date - start_date).astype(int)) + 1
+
+    customer_ids = customers_df["customer_id"].to_numpy()
+    product_ids = products_df["product_id"].to_numpy()
+    product_prices = products_df["price"].to_numpy(dtype=float)
+
+    # -------------------------------
+    # Transaction-level draws
+    # -------------------------------
+    customer_idx = rng.integers(0, len(customer_ids), num_transactions)
+    day_offsets = rng.integers(0, num_days, num_transactions)
+    payment_idx = rng.integers(0, len(PAYMENT_METHODS), num_transactions)
+    items_per_txn = draw_item_counts(count_rng, num_transactions)
+
+    # -------------------------------
+    # Item-level draws
+    # -------------------------------
+    num_items = int(items_per_txn.sum())
+    item_txn_idx = np.repeat(np.arange(num_transactions), items_per_txn)
+    product_idx = rng.integers(0, len(product_ids), num_items)
+    quantity = rng.integers(1, 6, num_items)
+    discount = np.asarray(DISCOUNTS)[rng.integers(0, len(DISCOUNTS), num_items)]
+
+    unit_price = product_prices[product_idx]
+    line_total = np.round(quantity * unit_price * (1 - discount / 100), 2)
+    total_amount = np.round(
+        np.bincount(item_txn_idx, weights=line_total, minlength=num_transactions), 2
+    )
 
-        price = round(random.uniform(min_price, max_price), 2)
-        cost = round(price * random.uniform(0.5, 0.85), 2)
+    txn_ids = generate_ids("TXN", txn_start, num_transactions, 5)
+    txn_dates = (start_date + day_offsets.astype("timedelta64[D]")).astype(str)
 
-        products.append({
-            "product_id": generate_id("PROD", i, 4),
-            "product_name": fake.word().title(),
-            "category": category,
-            "sub_category": fake.word().title(),
-            "price": price,
-            "cost": cost,
-            "brand": fake.company(),
-            "stock_quantity": random.randint(10, 1000),
-            "supplier_id": f"SUP{random.randint(1, 50):03d}"
-        })
+    transactions = pd.DataFrame({
+        "transaction_id": txn_ids,
+        "customer_id": customer_ids[customer_idx],
+        "transaction_date": txn_dates,
+        "transaction_time": "00:00:00",
+        "payment_method": np.asarray(PAYMENT_METHODS)[payment_idx],
+        "shipping_address": sample_pool(pools, "addresses", num_transactions, rng),
+        "total_amount": total_amount
+    })
 
-    return pd.DataFrame(products)
+    transaction_items = pd.DataFrame({
+        "item_id": generate_ids("ITEM", item_start, num_items, 5),
+        "transaction_id": txn_ids[item_txn_idx],
+        "product_id": product_ids[product_idx],
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "discount_percentage": discount,
+        "line_total": line_total
+    })
+
+    return transactions, transaction_items
+
+
+def generate_transactions(customers_df, products_df):
+    return generate_transaction_batch(
+        customers_df, products_df, config["data_generation"]["transactions"]
+    )
 
 
 # --------------------------------------------------
-# Generate Transactions & Transaction Items
+# Raw file output (CSV / Parquet)
 # --------------------------------------------------
-def generate_transactions(customers_df, products_df):
-    transactions = []
-    transaction_items = []
+RAW_FORMATS = {"csv": "csv", "parquet": "parquet"}
+
+# Columns stored with a real Arrow type instead of text in Parquet output
+ARROW_DATE_COLUMNS = {"registration_date", "transaction_date"}
+ARROW_TIME_COLUMNS = {"transaction_time"}
+
+
+def raw_path(name, fmt, directory=None):
+    return os.path.join(directory or DATA_RAW_DIR, f"{name}.{RAW_FORMATS[fmt]}")
+
+
+def to_arrow(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, column in enumerate(table.column_names):
+        if column in ARROW_DATE_COLUMNS:
+            values = pa.array(df[column].to_numpy().astype("datetime64[D]"))
+        elif column in ARROW_TIME_COLUMNS:
+            micros = pd.to_timedelta(df[column]).to_numpy().astype("int64") // 1000
+            values = pa.array(micros, pa.int64()).cast(pa.time64("us"))
+        else:
+            continue
+        table = table.set_column(i, column, values)
+    return table
+
+
+class RawWriter:
+    """Appends DataFrame chunks to one raw file, as CSV rows or Parquet row groups"""
+
+    def __init__(self, path, fmt, header=True, append=False):
+        if append and fmt != "csv":
+            raise ValueError("Appending to existing raw files is only supported for CSV")
+        self.path = path
+        self.fmt = fmt
+        self.header = header
+        self.started = append
+        self.parquet_writer = None
+
+    def write(self, df):
+        if self.fmt == "parquet":
+            table = to_arrow(df)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(
+                    self.path, table.schema,
+                    compression=config["raw_data"].get("parquet_compression", "snappy")
+                )
+            self.parquet_writer.write_table(
+                table,
+                row_group_size=config["raw_data"].get("parquet_row_group_size", 100000)
+            )
+        else:
+            df.to_csv(
+                self.path, mode="a" if self.started else "w",
+                header=self.header and not self.started, index=False
+            )
+        self.started = True
 
-    payment_methods = [
-        "Credit Card", "Debit Card", "UPI",
-        "Cash on Delivery", "Net Banking"
-    ]
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
 
-    start_date = datetime.strptime(config["data_generation"]["start_date"], "%Y-%m-%d")
-    end_date = datetime.strptime(config["data_generation"]["end_date"], "%Y-%m-%d")
+    def __enter__(self):
+        return self
 
-    item_counter = 1
-    txn_counter = 1
+    def __exit__(self, *exc):
+        self.close()
 
-    for _ in range(config["data_generation"]["transactions"]):
-        customer = customers_df.sample(1).iloc[0]
-        txn_date = random_date(start_date, end_date)
-        txn_id = generate_id("TXN", txn_counter, 5)
 
-        num_items = random.randint(
-            config["data_generation"]["min_items_per_txn"],
-            config["data_generation"]["max_items_per_txn"]
-        )
+def write_raw(df, name, fmt):
+    with RawWriter(raw_path(name, fmt), fmt) as writer:
+        writer.write(df)
+
+
+# --------------------------------------------------
+# Streaming (bounded-memory) generation
+# --------------------------------------------------
 
-        total_amount = 0.0
+def chunk_sizes(total, chunk_size):
+    for offset in range(0, total, chunk_size):
+        yield min(chunk_size, total - offset)
 
-        for _ in range(num_items):
-            product = products_df.sample(1).iloc[0]
-            quantity = random.randint(1, 5)
-            discount = random.choice([0, 5, 10, 15])
 
-            line_total = round(
-                quantity * product["price"] * (1 - discount / 100), 2
+def stream_transactions(customers_df, products_df, num_transactions, chunk_size,
+                        txn_path, items_path, txn_start=1, item_start=1,
+                        rng=None, count_rng=None, pools=None, header=True,
+                        progress=False, fmt="csv", append=False):
+    txn_counter = txn_start
+    item_counter = item_start
+    validation = empty_validation()
+
+    txn_writer = RawWriter(txn_path, fmt, header=header, append=append)
+    items_writer = RawWriter(items_path, fmt, header=header, append=append)
+
+    with txn_writer, items_writer:
+        for size in chunk_sizes(num_transactions, chunk_size):
+            txns, items = generate_transaction_batch(
+                customers_df, products_df, size,
+                txn_start=txn_counter, item_start=item_counter,
+                rng=rng, count_rng=count_rng, pools=pools
             )
 
-            transaction_items.append({
-                "item_id": generate_id("ITEM", item_counter, 5),
-                "transaction_id": txn_id,
-                "product_id": product["product_id"],
-                "quantity": quantity,
-                "unit_price": product["price"],
-                "discount_percentage": discount,
-                "line_total": line_total
-            })
-
-            total_amount += line_total
-            item_counter += 1
-
-        transactions.append({
-            "transaction_id": txn_id,
-            "customer_id": customer["customer_id"],
-            "transaction_date": txn_date.date(),
-            "transaction_time": txn_date.time(),
-            "payment_method": random.choice(payment_methods),
-            "shipping_address": fake.address().replace("\n", ", "),
-            "total_amount": round(total_amount, 2)
-        })
-
-        txn_counter += 1
+            txn_writer.write(txns)
+            items_writer.write(items)
+
+            accumulate_validation(
+                validation,
+                validate_referential_integrity(customers_df, products_df, txns, items)
+            )
+
+            txn_counter += len(txns)
+            item_counter += len(items)
+            if progress:
+                print(f"Generated {txn_counter - txn_start}/{num_transactions} transactions")
+
+    return txn_counter - txn_start, item_counter - item_start, validation
+
+
+def generate_transactions_streaming(customers_df, products_df, chunk_size, fmt="csv"):
+    return stream_transactions(
+        customers_df, products_df,
+        config["data_generation"]["transactions"], chunk_size,
+        raw_path("transactions", fmt), raw_path("transaction_items", fmt),
+        progress=True, fmt=fmt
+    )
+
+
+# --------------------------------------------------
+# Sharded multi-process generation
+# --------------------------------------------------
+def shard_seed(seed, shard_index, stream):
+    return np.random.SeedSequence(seed, spawn_key=(shard_index, stream))
+
+
+def plan_shards(total, workers):
+    base, extra = divmod(total, workers)
+    shards = []
+    txn_start = 1
+    for index in range(workers):
+        count = base + (1 if index < extra else 0)
+        shards.append({"index": index, "txn_start": txn_start, "count": count})
+        txn_start += count
+    return shards
+
+
+def count_shard_items(seed, shard, chunk_size):
+    # Replays only the item-count stream so item IDs can be assigned gap-free
+    count_rng = np.random.default_rng(shard_seed(seed, shard["index"], COUNT_STREAM))
+    return sum(
+        int(draw_item_counts(count_rng, size).sum())
+        for size in chunk_sizes(shard["count"], chunk_size)
+    )
+
+
+def shard_path(shard_dir, name, index, fmt="csv"):
+    return raw_path(f"{name}.part-{index:05d}", fmt, shard_dir)
+
+
+def generate_shard(seed, shard, customers_df, products_df, chunk_size, shard_dir,
+                   fmt="csv"):
+    return stream_transactions(
+        customers_df, products_df, shard["count"], chunk_size,
+        shard_path(shard_dir, "transactions", shard["index"], fmt),
+        shard_path(shard_dir, "transaction_items", shard["index"], fmt),
+        txn_start=shard["txn_start"], item_start=shard["item_start"],
+        rng=np.random.default_rng(shard_seed(seed, shard["index"], VALUE_STREAM)),
+        count_rng=np.random.default_rng(shard_seed(seed, shard["index"], COUNT_STREAM)),
+        pools=load_faker_pools(seed),
+        header=False, fmt=fmt
+    )
+
+
+def merge_shards(shard_dir, name, shards, columns, fmt="csv"):
+    parts = [
+        shard_path(shard_dir, name, shard["index"], fmt) for shard in shards
+        if os.path.exists(shard_path(shard_dir, name, shard["index"], fmt))
+    ]
+
+    if fmt == "parquet":
+        # Copy row groups one at a time so the merge never holds a whole shard
+        writer = None
+        for path in parts:
+            part = pq.ParquetFile(path)
+            for i in range(part.num_row_groups):
+                row_group = part.read_row_group(i)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        raw_path(name, fmt), row_group.schema,
+                        compression=config["raw_data"].get("parquet_compression", "snappy")
+                    )
+                writer.write_table(row_group)
+        if writer is not None:
+            writer.close()
+        return
+
+    with open(raw_path(name, fmt), "w", newline="") as out:
+        out.write(",".join(columns) + "\n")
+        for path in parts:
+            with open(path, "r", newline="") as part:
+                shutil.copyfileobj(part, out)
+
+
+def generate_transactions_sharded(customers_df, products_df, seed, workers, chunk_size,
+                                  fmt="csv"):
+    shards = plan_shards(config["data_generation"]["transactions"], workers)
+    shard_dir = os.path.join(DATA_RAW_DIR, "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    load_faker_pools(seed)  # build the cache once before workers start
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        item_counts = list(pool.map(
+            count_shard_items,
+            [seed] * workers, shards, [chunk_size] * workers
+        ))
+
+        item_start = 1
+        for shard, num_items in zip(shards, item_counts):
+            shard["item_start"] = item_start
+            item_start += num_items
+
+        results = list(pool.map(
+            generate_shard,
+            [seed] * workers, shards,
+            [customers_df] * workers, [products_df] * workers,
+            [chunk_size] * workers, [shard_dir] * workers, [fmt] * workers
+        ))
+
+    merge_shards(shard_dir, "transactions", shards, TRANSACTION_COLUMNS, fmt)
+    merge_shards(shard_dir, "transaction_items", shards, ITEM_COLUMNS, fmt)
+    shutil.rmtree(shard_dir)
+
+    validation = empty_validation()
+    for _, _, shard_validation in results:
+        accumulate_validation(validation, shard_validation)
 
     return (
-        pd.DataFrame(transactions),
-        pd.DataFrame(transaction_items)
+        sum(r[0] for r in results),
+        sum(r[1] for r in results),
+        validation
     )
 
 
 # --------------------------------------------------
 # Validation
 # --------------------------------------------------
+VALIDATION_KEYS = [
+    "orphan_customer_refs", "orphan_transaction_refs", "orphan_product_refs"
+]
+
+
+def quality_score(violations):
+    return 100 if violations == 0 else max(0, 100 - violations)
+
+
 def validate_referential_integrity(customers, products, transactions, items):
     orphan_txn_customers = ~transactions["customer_id"].isin(customers["customer_id"])
     orphan_item_txn = ~items["transaction_id"].isin(transactions["transaction_id"])
@@ -189,40 +558,300 @@ def validate_referential_integrity(customers, products, transactions, items):
         + orphan_item_product.sum()
     )
 
-    score = 100 if violations == 0 else max(0, 100 - violations)
-
     return {
         "orphan_customer_refs": int(orphan_txn_customers.sum()),
         "orphan_transaction_refs": int(orphan_item_txn.sum()),
         "orphan_product_refs": int(orphan_item_product.sum()),
-        "data_quality_score": score
+        "data_quality_score": quality_score(violations)
+    }
+
+
+def empty_validation():
+    validation = {key: 0 for key in VALIDATION_KEYS}
+    validation["data_quality_score"] = 100
+    return validation
+
+
+def accumulate_validation(totals, chunk):
+    for key in VALIDATION_KEYS:
+        totals[key] += chunk[key]
+    totals["data_quality_score"] = quality_score(
+        sum(totals[key] for key in VALIDATION_KEYS)
+    )
+    return totals
+
+
+# --------------------------------------------------
+# Delta (daily feed) generation
+# --------------------------------------------------
+def metadata_path():
+    return os.path.join(DATA_RAW_DIR, "generation_metadata.json")
+
+
+def load_generation_metadata():
+    if not os.path.exists(metadata_path()):
+        raise FileNotFoundError(
+            "Delta mode needs generation_metadata.json from a previous full run"
+        )
+    with open(metadata_path()) as f:
+        metadata = json.load(f)
+
+    if "id_counters" not in metadata:
+        counts = metadata["record_counts"]
+        metadata["id_counters"] = {
+            "next_customer": counts["customers"] + 1,
+            "next_product": counts["products"] + 1,
+            "next_transaction": counts["transactions"] + 1,
+            "next_item": counts["transaction_items"] + 1,
+        }
+    return metadata
+
+
+def read_raw_dimension(name, numeric_columns=()):
+    # Read as text so phone numbers, IDs and dates are written back unchanged
+    df = pd.read_csv(raw_path(name, "csv"), dtype=str, keep_default_na=False)
+    for column in numeric_columns:
+        df[column] = pd.to_numeric(df[column])
+    return df
+
+
+def change_customers(customers_df, fraction, rng, pools):
+    changed = rng.choice(len(customers_df), int(len(customers_df) * fraction), replace=False)
+    customers_df.loc[changed, "city"] = sample_pool(pools, "cities", len(changed), rng)
+    customers_df.loc[changed, "state"] = sample_pool(pools, "states", len(changed), rng)
+    return len(changed)
+
+
+def change_products(products_df, fraction, rng):
+    changed = rng.choice(len(products_df), int(len(products_df) * fraction), replace=False)
+    price = np.round(products_df.loc[changed, "price"] * rng.uniform(0.9, 1.1, len(changed)), 2)
+    products_df.loc[changed, "price"] = price
+    products_df.loc[changed, "cost"] = np.round(price * rng.uniform(0.5, 0.85, len(changed)), 2)
+    products_df.loc[changed, "stock_quantity"] = rng.integers(10, 1001, len(changed))
+    return len(changed)
+
+
+def generate_delta(args, chunk_size):
+    if args.format != "csv":
+        raise ValueError("Delta mode appends to the raw files and requires raw_data.format: csv")
+
+    metadata = load_generation_metadata()
+    counters = metadata["id_counters"]
+    batch = metadata.get("delta_batches", 0) + 1
+
+    rng = np.random.default_rng(np.random.SeedSequence(args.seed, spawn_key=(DELTA_STREAM, batch)))
+    pools = load_faker_pools(args.seed)
+
+    # -------------------------------
+    # Dimensions: new members + changed attributes (files rewritten, they are small)
+    # -------------------------------
+    customers_df = read_raw_dimension("customers")
+    products_df = read_raw_dimension("products", ["price", "cost", "stock_quantity"])
+
+    changed_customers = change_customers(customers_df, args.change_fraction, rng, pools)
+    changed_products = change_products(products_df, args.change_fraction, rng)
+
+    new_customers = generate_customers(
+        rng, pools, count=args.new_customers, start=counters["next_customer"]
+    )
+    new_products = generate_products(
+        rng, pools, count=args.new_products, start=counters["next_product"]
+    )
+    customers_df = pd.concat([customers_df, new_customers], ignore_index=True)
+    products_df = pd.concat([products_df, new_products], ignore_index=True)
+
+    write_raw(customers_df, "customers", "csv")
+    write_raw(products_df, "products", "csv")
+
+    # -------------------------------
+    # Facts: only new rows, appended after the last generated day
+    # -------------------------------
+    gen = config["data_generation"]
+    previous_end = pd.Timestamp(metadata["date_range"]["end"])
+    gen["start_date"] = (previous_end + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    gen["end_date"] = (previous_end + pd.Timedelta(days=args.delta_days)).strftime("%Y-%m-%d")
+
+    num_transactions, num_items, validation = stream_transactions(
+        customers_df, products_df, args.delta_transactions, chunk_size,
+        raw_path("transactions", "csv"), raw_path("transaction_items", "csv"),
+        txn_start=counters["next_transaction"], item_start=counters["next_item"],
+        rng=rng, pools=pools, append=True
+    )
+
+    counts = metadata["record_counts"]
+    counts["customers"] = len(customers_df)
+    counts["products"] = len(products_df)
+    counts["transactions"] += num_transactions
+    counts["transaction_items"] += num_items
+
+    counters["next_customer"] += args.new_customers
+    counters["next_product"] += args.new_products
+    counters["next_transaction"] += num_transactions
+    counters["next_item"] += num_items
+
+    metadata["generated_at"] = datetime.utcnow().isoformat()
+    metadata["date_range"]["end"] = gen["end_date"]
+    metadata["delta_batches"] = batch
+    metadata["last_delta"] = {
+        "batch": batch,
+        "date_range": {"start": gen["start_date"], "end": gen["end_date"]},
+        "new_customers": args.new_customers,
+        "changed_customers": changed_customers,
+        "new_products": args.new_products,
+        "changed_products": changed_products,
+        "transactions": num_transactions,
+        "transaction_items": num_items,
+        "validation": validation
     }
+    return metadata
+
+
+# --------------------------------------------------
+# Scale-factor profiles
+# --------------------------------------------------
+def apply_scale_factor(name):
+    profiles = config.get("scale_factors", {})
+    if name not in profiles:
+        raise ValueError(f"Unknown scale factor {name}; expected one of {sorted(profiles)}")
+
+    profile = profiles[name]
+    gen = config["data_generation"]
+
+    # History ends at the configured end_date and reaches back profile["years"] years
+    end_date = pd.Timestamp(gen["end_date"])
+    start_date = end_date - pd.DateOffset(years=profile["years"]) + pd.Timedelta(days=1)
+
+    gen["customers"] = profile["customers"]
+    gen["products"] = profile["products"]
+    gen["transactions"] = profile["transactions"]
+    gen["start_date"] = start_date.strftime("%Y-%m-%d")
+
+    return {"name": name, **profile}
 
 
 # --------------------------------------------------
 # Main Execution
 # --------------------------------------------------
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic e-commerce data")
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="write transactions in fixed-size chunks to keep memory flat"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help="transactions per chunk in streaming mode"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="generate transactions in N processes with per-shard seeds"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=SEED,
+        help="base random seed; output is identical for a given (seed, workers)"
+    )
+    parser.add_argument(
+        "--format", choices=sorted(RAW_FORMATS), default=config["raw_data"]["format"],
+        help="raw file format (defaults to raw_data.format)"
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="append a new batch after the last run recorded in generation_metadata.json"
+    )
+    parser.add_argument(
+        "--delta-days", type=int, default=1,
+        help="days of new transactions in a delta batch"
+    )
+    parser.add_argument(
+        "--delta-transactions", type=int, default=None,
+        help="transactions in a delta batch (defaults to a per-day share of data_generation.transactions)"
+    )
+    parser.add_argument(
+        "--new-customers", type=int, default=0, help="customers added in a delta batch"
+    )
+    parser.add_argument(
+        "--new-products", type=int, default=0, help="products added in a delta batch"
+    )
+    parser.add_argument(
+        "--change-fraction", type=float, default=0.0,
+        help="fraction of existing customers and products modified in a delta batch"
+    )
+    parser.add_argument(
+        "--scale-factor", choices=sorted(config.get("scale_factors", {})), default=None,
+        help="named dataset profile from scale_factors (overrides data_generation counts)"
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    scale_factor = apply_scale_factor(args.scale_factor) if args.scale_factor else None
+    chunk_size = args.chunk_size or config["data_generation"].get(
+        "chunk_size", config["pipeline"]["batch_size"]
+    )
+
+    seed_generators(args.seed)
+
+    if args.delta:
+        if args.delta_transactions is None:
+            gen = config["data_generation"]
+            history_days = (pd.Timestamp(gen["end_date"]) - pd.Timestamp(gen["start_date"])).days + 1
+            args.delta_transactions = max(1, gen["transactions"] * args.delta_days // history_days)
+
+        metadata = generate_delta(args, chunk_size)
+        with open(metadata_path(), "w") as f:
+            json.dump(metadata, f, indent=4)
+
+        print("✅ Delta generation completed successfully")
+        print(json.dumps(metadata["last_delta"], indent=2))
+        return
+
     customers_df = generate_customers()
     products_df = generate_products()
-    transactions_df, items_df = generate_transactions(customers_df, products_df)
 
-    customers_df.to_csv(os.path.join(DATA_RAW_DIR, "customers.csv"), index=False)
-    products_df.to_csv(os.path.join(DATA_RAW_DIR, "products.csv"), index=False)
-    transactions_df.to_csv(os.path.join(DATA_RAW_DIR, "transactions.csv"), index=False)
-    items_df.to_csv(os.path.join(DATA_RAW_DIR, "transaction_items.csv"), index=False)
+    write_raw(customers_df, "customers", args.format)
+    write_raw(products_df, "products", args.format)
 
-    validation = validate_referential_integrity(
-        customers_df, products_df, transactions_df, items_df
-    )
+    if args.workers > 1:
+        num_transactions, num_items, validation = generate_transactions_sharded(
+            customers_df, products_df, args.seed, args.workers, chunk_size, args.format
+        )
+    elif args.stream:
+        num_transactions, num_items, validation = generate_transactions_streaming(
+            customers_df, products_df, chunk_size, args.format
+        )
+    else:
+        transactions_df, items_df = generate_transactions(customers_df, products_df)
+
+        write_raw(transactions_df, "transactions", args.format)
+        write_raw(items_df, "transaction_items", args.format)
+
+        validation = validate_referential_integrity(
+            customers_df, products_df, transactions_df, items_df
+        )
+        num_transactions, num_items = len(transactions_df), len(items_df)
 
     metadata = {
         "generated_at": datetime.utcnow().isoformat(),
+        "scale_factor": scale_factor,
+        "generation_mode": {
+            "streaming": args.stream or args.workers > 1,
+            "chunk_size": chunk_size if args.stream or args.workers > 1 else None,
+            "workers": args.workers,
+            "seed": args.seed,
+            "format": args.format
+        },
         "record_counts": {
             "customers": len(customers_df),
             "products": len(products_df),
-            "transactions": len(transactions_df),
-            "transaction_items": len(items_df)
+            "transactions": num_transactions,
+            "transaction_items": num_items
+        },
+        "id_counters": {
+            "next_customer": len(customers_df) + 1,
+            "next_product": len(products_df) + 1,
+            "next_transaction": num_transactions + 1,
+            "next_item": num_items + 1
         },
         "date_range": {
             "start": config["data_generation"]["start_date"],
@@ -231,7 +860,7 @@ def main():
         "validation": validation
     }
 
-    with open(os.path.join(DATA_RAW_DIR, "generation_metadata.json"), "w") as f:
+    with open(metadata_path(), "w") as f:
         json.dump(metadata, f, indent=4)
 
     print("✅ Data generation completed successfully")
@@ -1,10 +1,23 @@
+import io
 import os
+import sys
+import gzip
 import json
+import hashlib
+import itertools
 import time
+import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
+import numpy as np
 import psycopg2
+import psycopg2.pool
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import yaml
 from psycopg2 import sql
 
@@ -51,11 +64,24 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", config["database"]["password"]),
 }
 
+RAW_FORMAT = config.get("raw_data", {}).get("format", "csv")
+INGESTION_CONFIG = config.get("ingestion", {})
+
+# Full reloads land in shadow tables here until they are swapped into staging
+LOAD_SCHEMA = "staging_load"
+
 TABLE_FILE_MAP = {
-    "staging.customers": "customers.csv",
-    "staging.products": "products.csv",
-    "staging.transactions": "transactions.csv",
-    "staging.transaction_items": "transaction_items.csv",
+    "staging.customers": "customers",
+    "staging.products": "products",
+    "staging.transactions": "transactions",
+    "staging.transaction_items": "transaction_items",
+}
+
+# Raw feeds may land compressed; these are decompressed on the fly into COPY
+COMPRESSED_SUFFIXES = (".csv.gz", ".csv.zst")
+RAW_SUFFIXES = {
+    "csv": (".csv",) + COMPRESSED_SUFFIXES,
+    "parquet": (".parquet",),
 }
 
 # --------------------------------------------------
@@ -89,29 +115,909 @@ def get_connection():
 # --------------------------------------------------
 # Bulk COPY loader
 # --------------------------------------------------
-def copy_csv_to_table(cursor, table_name, csv_path):
-    columns = COPY_COLUMNS[table_name]
-
-    with open(csv_path, "r", encoding="utf-8") as f:
-        next(f)  # skip CSV header
-        cursor.copy_expert(
-            sql.SQL("COPY {} ({}) FROM STDIN WITH CSV").format(
-                sql.Identifier(*table_name.split(".")),
-                sql.SQL(", ").join(map(sql.Identifier, columns))
-            ),
-            f
+def table_identifier(table_name):
+    return sql.Identifier(*table_name.split("."))
+
+
+def copy_statement(table_name, target=None):
+    return sql.SQL("COPY {} ({}) FROM STDIN WITH CSV").format(
+        table_identifier(target or table_name),
+        sql.SQL(", ").join(map(sql.Identifier, COPY_COLUMNS[table_name]))
+    )
+
+
+class CountingReader:
+    """File wrapper fed to COPY that counts rows and bytes and hashes content in one pass"""
+
+    closed = False  # lets pyarrow wrap it as a stream for the binary COPY path
+
+    def __init__(self, f, limit=None, hasher=None, stored=None):
+        self.f = f
+        self.remaining = limit
+        # For a compressed feed, the reader of the file as stored on disk
+        self.stored = stored
+        # An appended tail continues the hasher of the verified prefix
+        self.hasher = hasher or hashlib.sha256()
+        self.bytes = 0
+        self.newlines = 0
+        self.last_byte = b"\n"
+
+    def skip_header(self):
+        # The header is hashed (content_hash covers the whole file) but not sent to COPY
+        line = self.f.readline()
+        self.hasher.update(line)
+        self.bytes += len(line)
+
+    def read(self, size=-1):
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return b""
+            size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+
+        data = self.f.read(size)
+        if data:
+            self.hasher.update(data)
+            self.bytes += len(data)
+            self.newlines += data.count(b"\n")
+            self.last_byte = data[-1:]
+            if self.remaining is not None:
+                self.remaining -= len(data)
+        return data
+
+    @property
+    def rows(self):
+        return self.newlines + (0 if self.last_byte == b"\n" else 1)
+
+    def stats(self):
+        # Bytes and hash describe the file on disk, so they match the manifest's file hash
+        stored = self.stored or self
+        return {"rows": self.rows, "bytes": stored.bytes, "content_hash": stored.hasher.hexdigest()}
+
+
+def decompress_stream(path, fileobj):
+    if path.endswith(".gz"):
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(f"{os.path.basename(path)}: reading .zst feeds requires the zstandard package") from None
+    # Buffered for readline(), which the zstd stream reader does not implement
+    return io.BufferedReader(
+        zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True, closefd=False)
+    )
+
+
+@contextmanager
+def open_csv_source(path, source_range=None, append_from=None):
+    """Yield the CountingReader that feeds COPY for a raw CSV, header already skipped"""
+    with open(path, "rb") as f:
+        if path.endswith(COMPRESSED_SUFFIXES):
+            # Compressed feeds are never split or appended; the lower reader hashes
+            # the stored bytes while the upper one counts decompressed rows
+            stored = CountingReader(f)
+            with decompress_stream(path, stored) as stream:
+                reader = CountingReader(stream, stored=stored)
+                reader.skip_header()
+                yield reader
+            while stored.read(HASH_BLOCK_SIZE):
+                pass  # trailing bytes after the last frame still belong in the hash
+            return
+
+        if append_from is not None:
+            offset, prefix_hasher = append_from
+            f.seek(offset)
+            reader = CountingReader(f, hasher=prefix_hasher)
+        elif source_range is None:
+            reader = CountingReader(f)
+            reader.skip_header()
+        else:
+            f.seek(source_range[0])
+            reader = CountingReader(f, limit=source_range[1] - source_range[0])
+        yield reader
+
+
+def copy_csv_to_table(cursor, table_name, csv_path, target=None, source_range=None, append_from=None,
+                      reject_bad_rows=False):
+    statement = copy_statement(table_name, target)
+    rejected = []
+
+    with open_csv_source(csv_path, source_range, append_from) as reader:
+        if not reject_bad_rows:
+            cursor.copy_expert(statement, reader)
+        else:
+            position = (source_range or append_from or (0,))[0] + reader.bytes
+            for lines in iter_line_blocks(reader):
+                offsets = list(itertools.accumulate(map(len, lines), initial=position))
+                for index, error in copy_lines_bisecting(cursor, statement, lines):
+                    rejected.append((offsets[index], lines[index], error))
+                check_reject_limit(table_name, rejected)
+                position = offsets[-1]
+
+    stats = reader.stats()
+    if source_range is not None:
+        stats["content_hash"] = None  # a range hash says nothing about the file
+    if reject_bad_rows:
+        quarantine_rows(cursor, table_name, csv_path, rejected)
+        stats["rows"] -= len(rejected)
+        stats["rows_rejected"] = len(rejected)
+    return stats
+
+
+def row_group_bytes(metadata):
+    # Compressed bytes on disk; RowGroupMetaData only exposes them per column chunk
+    return sum(metadata.column(j).total_compressed_size for j in range(metadata.num_columns))
+
+
+def copy_parquet_to_table(cursor, table_name, parquet_path, target=None, source_range=None,
+                          reject_bad_rows=False):
+    # Each row group is re-encoded as CSV in memory and streamed into COPY;
+    # row counts and sizes come from the Parquet footer, not from a re-scan
+    parquet_file = pq.ParquetFile(parquet_path)
+    write_options = pa_csv.WriteOptions(include_header=False)
+    first, last = source_range or (0, parquet_file.num_row_groups)
+    statement = copy_statement(table_name, target)
+    stats = {"rows": 0, "bytes": 0, "content_hash": None}
+    rejected = []
+    row_start = sum(parquet_file.metadata.row_group(i).num_rows for i in range(first))
+
+    for i in range(first, last):
+        row_group = parquet_file.read_row_group(i, columns=COPY_COLUMNS[table_name])
+        buffer = io.BytesIO()
+        pa_csv.write_csv(row_group, buffer, write_options)
+
+        if reject_bad_rows:
+            # Rejected Parquet rows are located by row number rather than byte offset
+            lines = buffer.getvalue().splitlines(keepends=True)
+            for index, error in copy_lines_bisecting(cursor, statement, lines):
+                rejected.append((row_start + index, lines[index], error))
+            check_reject_limit(table_name, rejected)
+        else:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+
+        metadata = parquet_file.metadata.row_group(i)
+        stats["rows"] += metadata.num_rows
+        stats["bytes"] += row_group_bytes(metadata)
+        row_start += metadata.num_rows
+
+    if reject_bad_rows:
+        quarantine_rows(cursor, table_name, parquet_path, rejected)
+        stats["rows"] -= len(rejected)
+        stats["rows_rejected"] = len(rejected)
+    return stats
+
+# --------------------------------------------------
+# Fault-tolerant COPY: bisect failing blocks, quarantine bad rows
+# --------------------------------------------------
+REJECT_TABLE = "staging.rejected_rows"
+REJECT_BLOCK_SIZE = 8 * 1024 ** 2
+MAX_REJECTED_ROWS = INGESTION_CONFIG.get("max_rejected_rows", 1000)
+
+# Errors caused by a row's content; anything else (lost connection, ...) still fails the load
+ROW_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError)
+
+
+def iter_line_blocks(reader, block_size=REJECT_BLOCK_SIZE):
+    """Yield lists of complete lines totalling roughly block_size bytes"""
+    tail = b""
+    while True:
+        data = reader.read(block_size)
+        if not data:
+            break
+        data = tail + data
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            yield data[:cut].splitlines(keepends=True)
+        tail = data[cut:]
+    if tail:
+        yield [tail]
+
+
+def copy_lines_bisecting(cursor, statement, lines):
+    """COPY lines under a savepoint, halving any failing range down to single lines.
+
+    Returns (index, error) for every line left out; a clean block costs one COPY.
+    """
+    rejected = []
+    pending = [(0, len(lines))]
+
+    while pending:
+        start, end = pending.pop()
+        cursor.execute("SAVEPOINT copy_block")
+        try:
+            cursor.copy_expert(statement, io.BytesIO(b"".join(lines[start:end])))
+        except ROW_ERRORS as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT copy_block")
+            if end - start == 1:
+                rejected.append((start, str(e).strip()))
+            else:
+                middle = (start + end) // 2
+                pending += [(middle, end), (start, middle)]
+        cursor.execute("RELEASE SAVEPOINT copy_block")
+
+    return sorted(rejected)
+
+
+def check_reject_limit(table_name, rejected):
+    # A wrong delimiter or column order rejects everything; bisecting that row by row is pointless
+    if len(rejected) > MAX_REJECTED_ROWS:
+        raise ValueError(f"{table_name}: more than {MAX_REJECTED_ROWS} rejected rows, aborting")
+
+
+def quarantine_rows(cursor, table_name, path, rejected):
+    if not rejected:
+        return
+    logging.warning(f"{table_name}: {len(rejected)} rows quarantined in {REJECT_TABLE}")
+    cursor.executemany(
+        sql.SQL("""
+            INSERT INTO {} (table_name, source_file, source_offset, raw_line, error_message)
+            VALUES (%s, %s, %s, %s, %s)
+        """).format(table_identifier(REJECT_TABLE)),
+        [
+            (table_name, os.path.basename(path), offset,
+             line.decode("utf-8", errors="replace").replace("\x00", ""), error)
+            for offset, line, error in rejected
+        ]
+    )
+
+
+# --------------------------------------------------
+# Binary COPY: typed Arrow batches encoded in PGCOPY format
+# --------------------------------------------------
+COPY_FORMATS = ("csv", "binary")
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + b"\x00" * 8  # signature, flags, header extension
+PGCOPY_TRAILER = b"\xff\xff"
+PG_EPOCH_DAYS = 10957  # 2000-01-01 - 1970-01-01
+PG_EPOCH_MICROS = PG_EPOCH_DAYS * 86400 * 10 ** 6
+COPY_BUFFER_SIZE = 1024 ** 2
+
+
+def column_types(cursor, table_name):
+    schema, table = table_name.split(".")
+    cursor.execute("""
+        SELECT column_name, data_type, numeric_precision, numeric_scale
+        FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s
+    """, (schema, table))
+    types = {name: (data_type, precision, scale) for name, data_type, precision, scale in cursor.fetchall()}
+    return {name: types[name] for name in COPY_COLUMNS[table_name]}
+
+
+def arrow_type(pg_type):
+    data_type, precision, scale = pg_type
+    if data_type == "numeric":
+        return pa.decimal128(precision, scale)
+    return {
+        "integer": pa.int32(),
+        "bigint": pa.int64(),
+        "date": pa.date32(),
+        "time without time zone": pa.time64("us"),
+        "timestamp without time zone": pa.timestamp("us"),
+    }.get(data_type, pa.string())
+
+
+# Every column is encoded as an (n, width) matrix of length-prefixed fields padded
+# to the column's widest value, plus the used length of each row's field
+def fixed_width_fields(values, valid):
+    """Fields for fixed-width big-endian values ((n, width) uint8); NULL is length -1"""
+    n, width = values.shape
+    fields = np.empty((n, 4 + width), dtype=np.uint8)
+    fields[:, :4] = np.frombuffer(np.array(width, dtype=">i4").tobytes(), dtype=np.uint8)
+    fields[:, 4:] = values
+    lengths = np.full(n, 4 + width, dtype=np.int64)
+    if not valid.all():
+        fields[~valid, :4] = 0xFF
+        lengths[~valid] = 4
+    return fields, lengths
+
+
+def big_endian(values, dtype):
+    values = np.ascontiguousarray(values, dtype=dtype)
+    return values.view(np.uint8).reshape(len(values), -1)
+
+
+def decimal_units(array, precision, scale):
+    """Values of a numeric column as int64 multiples of 10^-scale"""
+    if pa.types.is_decimal(array.type):
+        array = array.cast(pa.decimal128(precision, scale))
+        words = np.frombuffer(array.buffers()[1], dtype="<i8")
+        return words[2 * array.offset:2 * (array.offset + len(array)):2].copy()
+    values = array.fill_null(0).to_numpy(zero_copy_only=False)
+    if pa.types.is_floating(array.type):
+        return np.round(values * 10 ** scale).astype(np.int64)
+    return values.astype(np.int64) * 10 ** scale
+
+
+def numeric_fields(array, valid, precision, scale):
+    # Fixed digit count per column; numeric_recv strips the leading/trailing zero digits
+    frac_groups = -(-scale // 4)
+    int_groups = -(-(precision - scale) // 4)
+    ndigits = int_groups + frac_groups
+    if precision + 4 * frac_groups - scale > 18:
+        raise ValueError(f"numeric({precision},{scale}) is too wide for binary COPY")
+
+    units = decimal_units(array, precision, scale)
+    magnitude = np.abs(units) * 10 ** (4 * frac_groups - scale)
+    powers = 10000 ** np.arange(ndigits - 1, -1, -1, dtype=np.int64)
+
+    words = np.empty((len(units), 4 + ndigits), dtype=">i2")
+    words[:, 0] = ndigits
+    words[:, 1] = int_groups - 1  # weight of the first digit
+    words[:, 2] = np.where(units < 0, 0x4000, 0)
+    words[:, 3] = scale
+    words[:, 4:] = magnitude[:, None] // powers % 10000
+    return fixed_width_fields(words.view(np.uint8), valid)
+
+
+def text_fields(array, valid):
+    array = array.cast(pa.string())
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int32)[array.offset:array.offset + len(array) + 1]
+    content = array.buffers()[2]
+    content = np.frombuffer(content, dtype=np.uint8) if content is not None else np.empty(0, np.uint8)
+
+    sizes = np.where(valid, np.diff(offsets), 0)
+    width = int(sizes.max(initial=0))
+
+    fields = np.empty((len(sizes), 4 + width), dtype=np.uint8)
+    fields[:, :4] = big_endian(np.where(valid, sizes, -1), ">i4")
+    if width and (sizes == width).all():
+        # Equal-length strings (generated IDs) sit back to back in the buffer
+        fields[:, 4:] = content[offsets[0]:offsets[-1]].reshape(-1, width)
+    elif width:
+        # Bytes past each string's end are gathered too but dropped by the row mask
+        positions = np.minimum(offsets[:-1, None] + np.arange(width), len(content) - 1)
+        fields[:, 4:] = content[positions]
+    return fields, sizes.astype(np.int64) + 4
+
+
+def encode_binary_column(array, pg_type):
+    """Padded PGCOPY fields of one column: ((n, width) uint8, per-row field lengths)"""
+    data_type, precision, scale = pg_type
+    valid = array.is_valid().to_numpy(zero_copy_only=False)
+
+    if data_type == "numeric":
+        return numeric_fields(array, valid, precision, scale)
+    if data_type in ("integer", "bigint"):
+        dtype = ">i4" if data_type == "integer" else ">i8"
+        values = array.fill_null(0).to_numpy(zero_copy_only=False)
+        return fixed_width_fields(big_endian(values, dtype), valid)
+    if data_type == "date":
+        days = array.cast(pa.date32()).cast(pa.int32()).fill_null(0).to_numpy(zero_copy_only=False)
+        return fixed_width_fields(big_endian(days - PG_EPOCH_DAYS, ">i4"), valid)
+    if data_type == "time without time zone":
+        micros = array.cast(pa.time64("us")).cast(pa.int64()).fill_null(0).to_numpy(zero_copy_only=False)
+        return fixed_width_fields(big_endian(micros, ">i8"), valid)
+    if data_type == "timestamp without time zone":
+        micros = array.cast(pa.timestamp("us")).cast(pa.int64()).fill_null(0).to_numpy(zero_copy_only=False)
+        return fixed_width_fields(big_endian(micros - PG_EPOCH_MICROS, ">i8"), valid)
+    return text_fields(array, valid)
+
+
+def encode_binary_rows(batch, types):
+    """Encode an Arrow record batch as PGCOPY tuples"""
+    columns = [encode_binary_column(batch.column(name), pg_type) for name, pg_type in types.items()]
+    width = 2 + sum(fields.shape[1] for fields, _ in columns)
+
+    # Lay rows out side by side in a padded matrix, then one boolean mask drops
+    # the padding; row-major compaction yields the tuples back to back
+    padded = np.empty((batch.num_rows, width), dtype=np.uint8)
+    padded[:, 0], padded[:, 1] = len(columns) >> 8, len(columns) & 0xFF
+    start = 2
+    for fields, _ in columns:
+        padded[:, start:start + fields.shape[1]] = fields
+        start += fields.shape[1]
+
+    if all((lengths == fields.shape[1]).all() for fields, lengths in columns):
+        return padded.tobytes()  # no padding anywhere (no NULLs, equal-length strings)
+
+    used = np.ones((batch.num_rows, width), dtype=bool)
+    start = 2
+    for fields, lengths in columns:
+        used[:, start:start + fields.shape[1]] = np.arange(fields.shape[1]) < lengths[:, None]
+        start += fields.shape[1]
+    return padded[used].tobytes()
+
+
+class BinaryCopyStream:
+    """File-like COPY ... BINARY feed that encodes Arrow batches as they are read"""
+
+    def __init__(self, batches, types):
+        self.batches = iter(batches)
+        self.types = types
+        self.buffer = PGCOPY_HEADER
+        self.position = 0
+        self.done = False
+
+    def read(self, size=-1):
+        while self.position >= len(self.buffer):
+            if self.done:
+                return b""
+            batch = next(self.batches, None)
+            if batch is None:
+                self.buffer, self.done = PGCOPY_TRAILER, True
+            else:
+                self.buffer = encode_binary_rows(batch, self.types)
+            self.position = 0
+
+        end = len(self.buffer) if size is None or size < 0 else self.position + size
+        data = self.buffer[self.position:end]
+        self.position += len(data)
+        return data
+
+
+def binary_copy_statement(table_name, target=None):
+    return sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT binary)").format(
+        table_identifier(target or table_name),
+        sql.SQL(", ").join(map(sql.Identifier, COPY_COLUMNS[table_name]))
+    )
+
+
+def copy_binary_to_table(cursor, table_name, path, target=None, source_range=None, append_from=None):
+    types = column_types(cursor, table_name)
+    statement = binary_copy_statement(table_name, target)
+
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        first, last = source_range or (0, parquet_file.num_row_groups)
+        batches = parquet_file.iter_batches(row_groups=range(first, last), columns=list(types))
+        cursor.copy_expert(statement, BinaryCopyStream(batches, types), size=COPY_BUFFER_SIZE)
+        metadata = [parquet_file.metadata.row_group(i) for i in range(first, last)]
+        return {
+            "rows": sum(m.num_rows for m in metadata),
+            "bytes": sum(row_group_bytes(m) for m in metadata),
+            "content_hash": None
+        }
+
+    # The CSV is parsed into typed batches by pyarrow; the CountingReader underneath
+    # still sees every byte once, so rows, bytes and content_hash come for free
+    with open_csv_source(path, source_range, append_from) as reader:
+        csv_reader = pa_csv.open_csv(
+            pa.PythonFile(reader, mode="r"),
+            read_options=pa_csv.ReadOptions(column_names=list(types)),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: arrow_type(pg_type) for name, pg_type in types.items()},
+                # Same NULL rules as COPY ... CSV: only an unquoted empty field is NULL
+                null_values=[""], strings_can_be_null=True, quoted_strings_can_be_null=False
+            )
+        )
+        cursor.copy_expert(statement, BinaryCopyStream(csv_reader, types), size=COPY_BUFFER_SIZE)
+
+    stats = reader.stats()
+    if source_range is not None:
+        stats["content_hash"] = None
+    return stats
+
+
+def copy_file_to_table(cursor, table_name, path, target=None, source_range=None, append_from=None,
+                       copy_format="csv", reject_bad_rows=False):
+    if copy_format == "binary":
+        return copy_binary_to_table(cursor, table_name, path, target, source_range, append_from)
+    if path.endswith(".parquet"):
+        return copy_parquet_to_table(cursor, table_name, path, target, source_range, reject_bad_rows)
+    return copy_csv_to_table(cursor, table_name, path, target, source_range, append_from, reject_bad_rows)
+
+
+def table_summary(stats, seconds):
+    seconds = max(seconds, 1e-6)
+    summary = {
+        "rows_loaded": stats["rows"],
+        "status": "success",
+        "error_message": None,
+        "bytes": stats["bytes"],
+        "content_hash": stats["content_hash"],
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(stats["rows"] / seconds, 1),
+        "mb_per_second": round(stats["bytes"] / seconds / 1024 ** 2, 2)
+    }
+    for key in ("ranges", "rows_rejected"):
+        if key in stats:
+            summary[key] = stats[key]
+    return summary
+
+# --------------------------------------------------
+# Load manifest: skip unchanged files, append extended ones
+# --------------------------------------------------
+MANIFEST_TABLE = "staging.load_manifest"
+HASH_BLOCK_SIZE = 1024 ** 2
+
+
+def file_info(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": datetime.fromtimestamp(stat.st_mtime)}
+
+
+def hash_prefix(path, size):
+    """SHA-256 of the first `size` bytes; returns the live hasher and the last byte read"""
+    hasher = hashlib.sha256()
+    last_byte = b"\n"
+    with open(path, "rb") as f:
+        remaining = size
+        while remaining > 0:
+            data = f.read(min(HASH_BLOCK_SIZE, remaining))
+            if not data:
+                break
+            hasher.update(data)
+            last_byte = data[-1:]
+            remaining -= len(data)
+    return hasher, last_byte
+
+
+def read_manifest(cursor):
+    cursor.execute(
+        sql.SQL(
+            "SELECT table_name, source_file, file_size, file_mtime, content_hash, row_count FROM {}"
+        ).format(table_identifier(MANIFEST_TABLE))
+    )
+    columns = ["table_name", "source_file", "file_size", "file_mtime", "content_hash", "row_count"]
+    return {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+
+
+def plan_table_load(entry, path, full_reload=False):
+    """Decide between a full reload, an append of the new tail, or skipping the table"""
+    info = file_info(path)
+    plan = {"load_type": "full", "path": path, **info}
+
+    if full_reload or entry is None or entry["source_file"] != os.path.basename(path):
+        return plan
+
+    if info["size"] == entry["file_size"]:
+        unchanged = info["mtime"] == entry["file_mtime"] or (
+            # Touched but maybe not modified: only a content hash can tell
+            entry["content_hash"] is not None
+            and hash_prefix(path, info["size"])[0].hexdigest() == entry["content_hash"]
         )
+        if unchanged:
+            return {**plan, "load_type": "skipped", "rows": entry["row_count"],
+                    "content_hash": entry["content_hash"]}
+        return plan
+
+    # Appending needs a plain CSV whose old contents are an intact, line-terminated prefix
+    if (
+        info["size"] > entry["file_size"]
+        and entry["content_hash"] is not None
+        and path.endswith(".csv")
+    ):
+        hasher, last_byte = hash_prefix(path, entry["file_size"])
+        if hasher.hexdigest() == entry["content_hash"] and last_byte == b"\n":
+            return {**plan, "load_type": "append", "append_from": (entry["file_size"], hasher),
+                    "previous_rows": entry["row_count"]}
+
+    return plan
+
+
+def plan_table_loads(cursor, sources, full_reload=False, copy_options=None):
+    manifest = read_manifest(cursor)
+    plans = {}
+    for table, path in sources.items():
+        plans[table] = {**plan_table_load(manifest.get(table), path, full_reload), "copy_options": copy_options or {}}
+        logging.info(f"{table}: {plans[table]['load_type']} load planned")
+    return plans
+
+
+def record_manifest(cursor, table_name, plan, row_count, content_hash):
+    if content_hash is None:
+        # Parquet and range loads never see the whole byte stream, so hash the file separately
+        content_hash = hash_prefix(plan["path"], plan["size"])[0].hexdigest()
+
+    cursor.execute(
+        sql.SQL("""
+            INSERT INTO {} (table_name, source_file, file_size, file_mtime, content_hash, row_count, loaded_at)
+            VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                source_file = EXCLUDED.source_file,
+                file_size = EXCLUDED.file_size,
+                file_mtime = EXCLUDED.file_mtime,
+                content_hash = EXCLUDED.content_hash,
+                row_count = EXCLUDED.row_count,
+                loaded_at = EXCLUDED.loaded_at
+        """).format(table_identifier(MANIFEST_TABLE)),
+        (table_name, os.path.basename(plan["path"]), plan["size"], plan["mtime"], content_hash, row_count)
+    )
+
+
+def touch_manifest(cursor, table_name, plan):
+    # A skipped file whose mtime moved keeps its rows; remember the new mtime
+    cursor.execute(
+        sql.SQL("UPDATE {} SET file_mtime = %s WHERE table_name = %s").format(
+            table_identifier(MANIFEST_TABLE)
+        ),
+        (plan["mtime"], table_name)
+    )
+
+
+def skipped_summary(plan):
+    return {
+        "rows_loaded": 0,
+        "status": "skipped",
+        "error_message": None,
+        "load_type": "skipped",
+        "rows_in_table": plan["rows"],
+        "content_hash": plan["content_hash"]
+    }
+
+
+def load_incremental(cursor, table_name, plan):
+    """Apply an append or skipped plan to the live table; returns (expected rows or None, summary)"""
+    if plan["load_type"] == "skipped":
+        touch_manifest(cursor, table_name, plan)
+        return None, skipped_summary(plan)
+
+    logging.info(f"Appending {plan['size'] - plan['append_from'][0]} new bytes to {table_name}")
+    started = time.time()
+    stats = copy_file_to_table(
+        cursor, table_name, plan["path"], append_from=plan["append_from"], **plan["copy_options"]
+    )
+    total_rows = plan["previous_rows"] + stats["rows"]
+    record_manifest(cursor, table_name, plan, total_rows, stats["content_hash"])
+    return total_rows, {**table_summary(stats, time.time() - started), "load_type": "append"}
+
+# --------------------------------------------------
+# Shadow tables + atomic swap
+# --------------------------------------------------
+def shadow_table(table_name):
+    return f"{LOAD_SCHEMA}.{table_name.split('.')[1]}"
+
+
+def create_shadow_table(cursor, table_name, bulk=False):
+    shadow = table_identifier(shadow_table(table_name))
+    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(shadow))
+    if bulk:
+        # Indexes are built from the live table's definitions once COPY is done
+        statement = "CREATE UNLOGGED TABLE {} (LIKE {} INCLUDING ALL EXCLUDING INDEXES)"
+    else:
+        statement = "CREATE TABLE {} (LIKE {} INCLUDING ALL)"
+    cursor.execute(sql.SQL(statement).format(shadow, table_identifier(table_name)))
+
+
+def drop_shadow_table(cursor, table_name):
+    cursor.execute(
+        sql.SQL("DROP TABLE IF EXISTS {}").format(table_identifier(shadow_table(table_name)))
+    )
+
+
+def swap_in_shadow_table(cursor, table_name):
+    # Moving the shadow table across schemas keeps its index names identical to
+    # the table it replaces; readers keep seeing the old rows until COMMIT
+    cursor.execute(sql.SQL("DROP TABLE {}").format(table_identifier(table_name)))
+    cursor.execute(
+        sql.SQL("ALTER TABLE {} SET SCHEMA {}").format(
+            table_identifier(shadow_table(table_name)),
+            sql.Identifier(table_name.split(".")[0])
+        )
+    )
+
+
+# --------------------------------------------------
+# Bulk mode: UNLOGGED load, deferred indexes, ANALYZE
+# --------------------------------------------------
+@contextmanager
+def timed_phase(phases, name):
+    started = time.time()
+    yield
+    phases[name] = round(time.time() - started, 3)
+
+
+def index_definitions(cursor, table_name):
+    """Key constraints and standalone indexes of a table as (kind, name, definition)"""
+    cursor.execute("""
+        SELECT 'constraint', conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('p', 'u')
+        UNION ALL
+        SELECT 'index', i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = %s::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+    """, (table_name, table_name))
+    return cursor.fetchall()
+
+
+def create_indexes(cursor, table_name, definitions, source_table=None):
+    # Definitions read from source_table (the live table for a shadow) are re-pointed at table_name
+    for kind, name, definition in definitions:
+        if kind == "constraint":
+            cursor.execute(
+                sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} ").format(
+                    table_identifier(table_name), sql.Identifier(name)
+                ) + sql.SQL(definition)
+            )
+        else:
+            cursor.execute(
+                definition.replace(f" ON {source_table or table_name} ", f" ON {table_name} ")
+            )
+
+
+def set_logged(cursor, table_name, logged):
+    cursor.execute(
+        sql.SQL("ALTER TABLE {} SET {}").format(
+            table_identifier(table_name), sql.SQL("LOGGED" if logged else "UNLOGGED")
+        )
+    )
+
+
+def finish_bulk_table(cursor, table_name, definitions, phases, source_table=None):
+    # Back to LOGGED before indexing so the rewrite does not also copy the indexes
+    with timed_phase(phases, "relog"):
+        set_logged(cursor, table_name, True)
+    with timed_phase(phases, "index"):
+        create_indexes(cursor, table_name, definitions, source_table)
+    with timed_phase(phases, "analyze"):
+        cursor.execute(sql.SQL("ANALYZE {}").format(table_identifier(table_name)))
+
+
+def plan_source_ranges(path, parts):
+    """Split a raw file into ranges that separate connections can COPY independently"""
+    if path.endswith(".parquet"):
+        groups = pq.ParquetFile(path).num_row_groups
+        bounds = sorted({groups * i // parts for i in range(parts + 1)})
+        return list(zip(bounds, bounds[1:]))
+
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()  # header
+        offsets = [f.tell()]
+        for i in range(1, parts):
+            target = offsets[0] + (size - offsets[0]) * i // parts
+            f.seek(max(target, offsets[-1]) - 1)
+            f.readline()  # move to the start of the next line
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+
+    return [(a, b) for a, b in zip(offsets, offsets[1:]) if b > a]
+
+
+def plan_load_tasks(table, path, copy_options=None):
+    split_bytes = INGESTION_CONFIG.get("split_min_mb", 64) * 1024 ** 2
+    parts = INGESTION_CONFIG.get("split_ranges", 4) if os.path.getsize(path) > split_bytes else 1
+    if path.endswith(COMPRESSED_SUFFIXES):
+        parts = 1  # a compressed stream cannot be entered at an arbitrary byte offset
+
+    if parts == 1:
+        return [{"table": table, "path": path, "range": None, "copy_options": copy_options or {}}]
+    return [
+        {"table": table, "path": path, "range": source_range, "copy_options": copy_options or {}}
+        for source_range in plan_source_ranges(path, parts)
+    ]
+
+
+def run_load_task(pool, task):
+    conn = pool.getconn()
+    try:
+        started = time.time()
+        with conn.cursor() as cursor:
+            stats = copy_file_to_table(
+                cursor, task["table"], task["path"],
+                target=shadow_table(task["table"]), source_range=task["range"],
+                **task["copy_options"]
+            )
+        conn.commit()
+        return {"table": task["table"], "started": started, "finished": time.time(), **stats}
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def load_parallel(summary, workers, full_reload=False, bulk=False, copy_options=None):
+    pool = psycopg2.pool.ThreadedConnectionPool(1, workers + 1, **DB_CONFIG)
+    conn = pool.getconn()
+    cursor = conn.cursor()
+    sources = {}
+
+    try:
+        plans = plan_table_loads(cursor, resolve_sources(), full_reload, copy_options)
+        # Only full reloads go through shadow tables; appends and skips touch the live table
+        sources = {table: plan["path"] for table, plan in plans.items() if plan["load_type"] == "full"}
+
+        phases = {table: {} for table in sources}
+        for table in sources:
+            with timed_phase(phases[table], "prepare"):
+                create_shadow_table(cursor, table, bulk)
+            clear_checkpoints(cursor, table)  # the shadow no longer holds a chunked load's rows
+        conn.commit()
+
+        tasks = [
+            task for table, path in sources.items()
+            for task in plan_load_tasks(table, path, copy_options)
+        ]
+        logging.info(f"Loading {len(tasks)} ranges on {workers} connections")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda task: run_load_task(pool, task), tasks))
+
+        table_stats = {}
+        for table in sources:
+            table_results = [r for r in results if r["table"] == table]
+            table_stats[table] = {
+                "rows": sum(r["rows"] for r in table_results),
+                "bytes": sum(r["bytes"] for r in table_results),
+                "content_hash": table_results[0]["content_hash"] if len(table_results) == 1 else None,
+                "ranges": len(table_results),
+                "rows_rejected": sum(r.get("rows_rejected", 0) for r in table_results),
+                "seconds": (
+                    max(r["finished"] for r in table_results)
+                    - min(r["started"] for r in table_results)
+                )
+            }
+            phases[table]["copy"] = round(table_stats[table]["seconds"], 3)
+
+        if bulk:
+            for table in sources:
+                finish_bulk_table(
+                    cursor, shadow_table(table), index_definitions(cursor, table),
+                    phases[table], source_table=table
+                )
+
+        # -------------------------------
+        # Publish: swap every shadow table in one transaction
+        # -------------------------------
+        for table in sources:
+            swap_in_shadow_table(cursor, table)
+
+        expected_rows = {table: stats["rows"] for table, stats in table_stats.items()}
+        for table, stats in table_stats.items():
+            record_manifest(cursor, table, plans[table], stats["rows"], stats["content_hash"])
+
+        incremental = {}
+        for table, plan in plans.items():
+            if plan["load_type"] != "full":
+                rows, incremental[table] = load_incremental(cursor, table, plan)
+                if rows is not None:
+                    expected_rows[table] = rows
+
+        validation_results = validate_staging_load(cursor, expected_rows)
+        for table, result in validation_results.items():
+            if result["status"] != "success":
+                raise ValueError(f"Row count mismatch in {table}")
+
+        conn.commit()
+        logging.info("Shadow tables swapped in and committed")
+
+        for table, stats in table_stats.items():
+            summary["tables_loaded"][table] = {
+                **table_summary(stats, stats["seconds"]), "load_type": "full"
+            }
+            if bulk:
+                summary["tables_loaded"][table]["phases"] = phases[table]
+        summary["tables_loaded"].update(incremental)
+
+    except Exception:
+        conn.rollback()
+        for table in sources:
+            drop_shadow_table(cursor, table)
+        conn.commit()
+        logging.error("Parallel load rolled back; shadow tables dropped")
+        raise
+
+    finally:
+        cursor.close()
+        pool.putconn(conn)
+        pool.closeall()
+
+
+def resolve_sources():
+    sources = {}
+    for table, name in TABLE_FILE_MAP.items():
+        candidates = [os.path.join(RAW_DATA_DIR, name + suffix) for suffix in RAW_SUFFIXES[RAW_FORMAT]]
+        existing = [path for path in candidates if os.path.exists(path)]
+        if not existing:
+            raise FileNotFoundError(f"Missing raw file: {name} ({', '.join(RAW_SUFFIXES[RAW_FORMAT])})")
+        # A freshly landed archive wins over a stale decompressed copy
+        sources[table] = max(existing, key=os.path.getmtime)
+    return sources
 
 # --------------------------------------------------
 # Validation
 # --------------------------------------------------
-def validate_staging_load(cursor):
+def validate_staging_load(cursor, source_rows):
+    # source_rows comes from the loader's single pass (or Parquet metadata),
+    # so validation never re-reads the raw files
     results = {}
 
-    for table, csv_file in TABLE_FILE_MAP.items():
-        csv_path = os.path.join(RAW_DATA_DIR, csv_file)
-        csv_count = sum(1 for _ in open(csv_path, encoding="utf-8")) - 1
-
+    for table, source_count in source_rows.items():
         cursor.execute(
             sql.SQL("SELECT COUNT(*) FROM {}").format(
                 sql.Identifier(*table.split("."))
@@ -120,24 +1026,17 @@ def validate_staging_load(cursor):
         db_count = cursor.fetchone()[0]
 
         results[table] = {
-            "csv_rows": csv_count,
+            "source_rows": source_count,
             "db_rows": db_count,
-            "status": "success" if csv_count == db_count else "mismatch"
+            "status": "success" if source_count == db_count else "mismatch"
         }
 
     return results
 
 # --------------------------------------------------
-# Main ingestion logic
+# Serial load: single connection, single transaction
 # --------------------------------------------------
-def main():
-    start_time = time.time()
-    summary = {
-        "ingestion_timestamp": datetime.now(timezone.utc).isoformat(),
-        "tables_loaded": {},
-        "total_execution_time_seconds": 0.0
-    }
-
+def load_serial(summary, full_reload=False, bulk=False, copy_options=None):
     conn = None
     cursor = None
 
@@ -148,59 +1047,230 @@ def main():
 
         logging.info("Connected to PostgreSQL")
 
+        plans = plan_table_loads(cursor, resolve_sources(), full_reload, copy_options)
+
         # -------------------------------
-        # Truncate staging tables
+        # Bulk load raw files into shadow tables; the live staging
+        # tables stay readable (no TRUNCATE lock) until the swap
         # -------------------------------
-        for table in TABLE_FILE_MAP:
-            logging.info(f"Truncating {table}")
-            cursor.execute(
-                sql.SQL("TRUNCATE {}").format(
-                    sql.Identifier(*table.split("."))
+        source_rows = {}
+        table_summaries = {}
+        for table, plan in plans.items():
+            if plan["load_type"] != "full":
+                continue
+
+            logging.info(f"Loading {os.path.basename(plan['path'])} into {shadow_table(table)}")
+            started = time.time()
+            phases = {}
+            with timed_phase(phases, "prepare"):
+                create_shadow_table(cursor, table, bulk)
+                clear_checkpoints(cursor, table)
+
+            with timed_phase(phases, "copy"):
+                stats = copy_file_to_table(
+                    cursor, table, plan["path"], target=shadow_table(table), **plan["copy_options"]
                 )
-            )
+
+            if bulk:
+                finish_bulk_table(
+                    cursor, shadow_table(table), index_definitions(cursor, table), phases, source_table=table
+                )
+
+            source_rows[table] = stats["rows"]
+            table_summaries[table] = {**table_summary(stats, time.time() - started), "load_type": "full"}
+            if bulk:
+                table_summaries[table]["phases"] = phases
 
         # -------------------------------
-        # Bulk load CSVs
+        # Swap shadows in; appends go straight to the live tables
         # -------------------------------
-        for table, csv_file in TABLE_FILE_MAP.items():
-            csv_path = os.path.join(RAW_DATA_DIR, csv_file)
-
-            if not os.path.exists(csv_path):
-                raise FileNotFoundError(f"Missing CSV file: {csv_file}")
+        for table in source_rows:
+            swap_in_shadow_table(cursor, table)
+            record_manifest(cursor, table, plans[table], source_rows[table], table_summaries[table]["content_hash"])
 
-            logging.info(f"Loading {csv_file} into {table}")
-            copy_csv_to_table(cursor, table, csv_path)
-
-            summary["tables_loaded"][table] = {
-                "rows_loaded": sum(1 for _ in open(csv_path, encoding="utf-8")) - 1,
-                "status": "success",
-                "error_message": None
-            }
+        for table, plan in plans.items():
+            if plan["load_type"] != "full":
+                rows, table_summaries[table] = load_incremental(cursor, table, plan)
+                if rows is not None:
+                    source_rows[table] = rows
 
         # -------------------------------
         # Validation
         # -------------------------------
-        validation_results = validate_staging_load(cursor)
+        validation_results = validate_staging_load(cursor, source_rows)
         for table, result in validation_results.items():
             if result["status"] != "success":
                 raise ValueError(f"Row count mismatch in {table}")
 
         conn.commit()
         logging.info("Transaction committed successfully")
+        summary["tables_loaded"].update(table_summaries)
 
-    except Exception as e:
-        logging.error(f"Ingestion failed: {e}")
-
+    except Exception:
         if conn:
             conn.rollback()
             logging.error("Transaction rolled back")
+        raise
+
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+
+# --------------------------------------------------
+# Chunked load: resumable, checkpointed shadow tables
+# --------------------------------------------------
+CHECKPOINT_TABLE = "staging.load_checkpoints"
+
+
+def plan_chunk_ranges(path):
+    if path.endswith(COMPRESSED_SUFFIXES):
+        return [None]  # a compressed stream can only be loaded as one chunk
+    chunk_bytes = int(INGESTION_CONFIG.get("chunk_mb", 256) * 1024 ** 2)
+    return plan_source_ranges(path, max(1, -(-os.path.getsize(path) // chunk_bytes)))
+
+
+def chunk_bounds(source_range, plan):
+    return source_range or (0, plan["size"])
+
+
+def clear_checkpoints(cursor, table_name):
+    cursor.execute(
+        sql.SQL("DELETE FROM {} WHERE table_name = %s").format(table_identifier(CHECKPOINT_TABLE)),
+        (table_name,)
+    )
+
+
+def committed_chunks(cursor, table_name, plan, ranges):
+    """Rows per chunk committed by an earlier attempt on the same file, or None to start over"""
+    cursor.execute("SELECT to_regclass(%s)", (shadow_table(table_name),))
+    if cursor.fetchone()[0] is None:
+        return None
+
+    cursor.execute(
+        sql.SQL("""
+            SELECT chunk_index, source_file, file_size, file_mtime, range_start, range_end, row_count
+            FROM {} WHERE table_name = %s
+        """).format(table_identifier(CHECKPOINT_TABLE)),
+        (table_name,)
+    )
+    checkpoints = cursor.fetchall()
+    if not checkpoints:
+        return None
+
+    source = (os.path.basename(plan["path"]), plan["size"], plan["mtime"])
+    done = {}
+    for index, source_file, size, mtime, start, end, rows in checkpoints:
+        # A changed file or chunk size makes every committed chunk suspect
+        if (source_file, size, mtime) != source or index >= len(ranges):
+            return None
+        if (start, end) != tuple(chunk_bounds(ranges[index], plan)):
+            return None
+        done[index] = rows
+    return done
+
+
+def record_checkpoint(cursor, table_name, plan, index, bounds, rows):
+    cursor.execute(
+        sql.SQL("""
+            INSERT INTO {} (table_name, chunk_index, source_file, file_size, file_mtime,
+                            range_start, range_end, row_count)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """).format(table_identifier(CHECKPOINT_TABLE)),
+        (table_name, index, os.path.basename(plan["path"]), plan["size"], plan["mtime"],
+         bounds[0], bounds[1], rows)
+    )
 
-        for table in TABLE_FILE_MAP:
-            summary["tables_loaded"].setdefault(table, {
-                "rows_loaded": 0,
-                "status": "failed",
-                "error_message": str(e)
-            })
+
+def load_table_chunks(conn, cursor, table_name, plan):
+    """COPY a raw file into its shadow table one committed chunk at a time"""
+    ranges = plan_chunk_ranges(plan["path"])
+    done = committed_chunks(cursor, table_name, plan, ranges)
+
+    if done is None:
+        done = {}
+        clear_checkpoints(cursor, table_name)
+        create_shadow_table(cursor, table_name)
+        conn.commit()
+    elif done:
+        logging.info(f"{table_name}: resuming after {len(done)} of {len(ranges)} committed chunks")
+
+    started = time.time()
+    stats = {"rows": sum(done.values()), "bytes": 0, "content_hash": None, "rows_rejected": 0}
+
+    for index, source_range in enumerate(ranges):
+        if index in done:
+            continue
+
+        chunk = copy_file_to_table(
+            cursor, table_name, plan["path"], target=shadow_table(table_name),
+            source_range=source_range, **plan["copy_options"]
+        )
+        # The checkpoint commits with the chunk's rows, so neither can exist without the other
+        record_checkpoint(cursor, table_name, plan, index, chunk_bounds(source_range, plan), chunk["rows"])
+        conn.commit()
+
+        stats["rows"] += chunk["rows"]
+        stats["bytes"] += chunk["bytes"]
+        stats["rows_rejected"] += chunk.get("rows_rejected", 0)
+        logging.info(f"{table_name}: chunk {index + 1}/{len(ranges)} committed ({chunk['rows']} rows)")
+
+    stats.update(seconds=time.time() - started, chunks=len(ranges), resumed_chunks=len(done))
+    return stats
+
+
+def load_chunked(summary, full_reload=False, copy_options=None):
+    conn = None
+    cursor = None
+
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        plans = plan_table_loads(cursor, resolve_sources(), full_reload, copy_options)
+        table_stats = {
+            table: load_table_chunks(conn, cursor, table, plan)
+            for table, plan in plans.items() if plan["load_type"] == "full"
+        }
+
+        # -------------------------------
+        # Publish: swap every finished shadow table in one transaction
+        # -------------------------------
+        expected_rows = {}
+        for table, stats in table_stats.items():
+            swap_in_shadow_table(cursor, table)
+            record_manifest(cursor, table, plans[table], stats["rows"], stats["content_hash"])
+            clear_checkpoints(cursor, table)
+            expected_rows[table] = stats["rows"]
+
+        incremental = {}
+        for table, plan in plans.items():
+            if plan["load_type"] != "full":
+                rows, incremental[table] = load_incremental(cursor, table, plan)
+                if rows is not None:
+                    expected_rows[table] = rows
+
+        validation_results = validate_staging_load(cursor, expected_rows)
+        for table, result in validation_results.items():
+            if result["status"] != "success":
+                raise ValueError(f"Row count mismatch in {table}")
+
+        conn.commit()
+        logging.info("Chunked shadow tables swapped in and committed")
+
+        for table, stats in table_stats.items():
+            summary["tables_loaded"][table] = {
+                **table_summary(stats, stats["seconds"]), "load_type": "full",
+                "chunks": stats["chunks"], "resumed_chunks": stats["resumed_chunks"]
+            }
+        summary["tables_loaded"].update(incremental)
+
+    except Exception:
+        if conn:
+            conn.rollback()
+            logging.error("Chunked load failed; committed chunks are kept for the next attempt")
+        raise
 
     finally:
         if cursor:
@@ -208,6 +1278,151 @@ def main():
         if conn:
             conn.close()
 
+# --------------------------------------------------
+# COPY format benchmark
+# --------------------------------------------------
+BENCHMARK_REPEATS = 3
+
+
+def benchmark_copy_formats(repeats=BENCHMARK_REPEATS):
+    """Best-of-N COPY of every raw file into a temp table per format; nothing is committed"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    results = {}
+
+    try:
+        for table, path in resolve_sources().items():
+            target = f"pg_temp.benchmark_{table.split('.')[1]}"
+            cursor.execute(
+                sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS)").format(
+                    table_identifier(target), table_identifier(table)
+                )
+            )
+
+            results[table] = {}
+            for copy_format in COPY_FORMATS:
+                timings = []
+                for _ in range(repeats):
+                    cursor.execute(sql.SQL("TRUNCATE {}").format(table_identifier(target)))
+                    started = time.time()
+                    stats = copy_file_to_table(cursor, table, path, target=target, copy_format=copy_format)
+                    timings.append(max(time.time() - started, 1e-6))
+
+                results[table][copy_format] = {
+                    "rows": stats["rows"],
+                    "seconds": round(min(timings), 4),
+                    "rows_per_second": round(stats["rows"] / min(timings), 1)
+                }
+                logging.info(f"{table} {copy_format}: {results[table][copy_format]['rows_per_second']} rows/s")
+
+            results[table]["binary_speedup"] = round(
+                results[table]["csv"]["seconds"] / results[table]["binary"]["seconds"], 2
+            )
+
+    finally:
+        conn.rollback()
+        cursor.close()
+        conn.close()
+
+    return results
+
+# --------------------------------------------------
+# Main ingestion logic
+# --------------------------------------------------
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load raw files into the staging schema")
+    parser.add_argument(
+        "--parallel", action="store_true", default=INGESTION_CONFIG.get("parallel", False),
+        help="COPY tables on pooled connections into shadow tables, then swap them in"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=INGESTION_CONFIG.get("max_workers", 4),
+        help="connections used by --parallel"
+    )
+    parser.add_argument(
+        "--chunked", action="store_true", default=INGESTION_CONFIG.get("chunked", False),
+        help="commit ingestion.chunk_mb chunks into shadow tables and resume after a failure"
+    )
+    parser.add_argument(
+        "--bulk", action="store_true", default=INGESTION_CONFIG.get("bulk_mode", False),
+        help="load full reloads UNLOGGED without indexes, then rebuild indexes and ANALYZE"
+    )
+    parser.add_argument(
+        "--copy-format", choices=COPY_FORMATS, default=INGESTION_CONFIG.get("copy_format", "csv"),
+        help="binary encodes typed Arrow batches in PGCOPY format instead of streaming CSV text"
+    )
+    parser.add_argument(
+        "--reject-bad-rows", action="store_true", default=INGESTION_CONFIG.get("reject_bad_rows", False),
+        help="quarantine rows COPY rejects in staging.rejected_rows and load the rest"
+    )
+    parser.add_argument(
+        "--benchmark-copy", action="store_true",
+        help="time CSV vs binary COPY of every raw file into temp tables and exit"
+    )
+    parser.add_argument(
+        "--full-reload", action="store_true",
+        help="ignore the load manifest and reload every table from scratch"
+    )
+    args = parser.parse_args()
+
+    if args.chunked and args.parallel:
+        parser.error("--chunked and --parallel are separate load modes")
+    if args.reject_bad_rows and args.copy_format == "binary":
+        parser.error("--reject-bad-rows works on the CSV COPY path only")
+    if args.chunked and args.bulk:
+        # Committed chunks in an UNLOGGED shadow would not survive a crash
+        parser.error("--bulk cannot be combined with --chunked")
+    return args
+
+
+def main():
+    args = parse_args()
+
+    if args.benchmark_copy:
+        benchmark = {
+            "benchmark_timestamp": datetime.now(timezone.utc).isoformat(),
+            "raw_format": RAW_FORMAT,
+            "repeats": BENCHMARK_REPEATS,
+            "tables": benchmark_copy_formats()
+        }
+        benchmark_path = os.path.join(STAGING_DIR, "copy_benchmark.json")
+        with open(benchmark_path, "w") as f:
+            json.dump(benchmark, f, indent=4)
+        logging.info(f"COPY benchmark written to {benchmark_path}")
+        return
+
+    start_time = time.time()
+    summary = {
+        "ingestion_timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": "parallel" if args.parallel else "chunked" if args.chunked else "serial",
+        "bulk": args.bulk,
+        "copy_format": args.copy_format,
+        "reject_bad_rows": args.reject_bad_rows,
+        "tables_loaded": {},
+        "total_execution_time_seconds": 0.0
+    }
+
+    copy_options = {"copy_format": args.copy_format, "reject_bad_rows": args.reject_bad_rows}
+    failed = False
+    try:
+        if args.parallel:
+            load_parallel(summary, args.workers, args.full_reload, args.bulk, copy_options)
+        elif args.chunked:
+            load_chunked(summary, args.full_reload, copy_options)
+        else:
+            load_serial(summary, args.full_reload, args.bulk, copy_options)
+
+    except Exception as e:
+        failed = True
+        logging.error(f"Ingestion failed: {e}")
+
+        for table in TABLE_FILE_MAP:
+            summary["tables_loaded"].setdefault(table, {
+                "rows_loaded": 0,
+                "status": "failed",
+                "error_message": str(e)
+            })
+
     summary["total_execution_time_seconds"] = round(time.time() - start_time, 2)
 
     summary_path = os.path.join(STAGING_DIR, "ingestion_summary.json")
@@ -215,6 +1430,10 @@ def main():
         json.dump(summary, f, indent=4)
 
     logging.info(f"Ingestion summary written to {summary_path}")
+
+    if failed:
+        # Non-zero exit lets the orchestrator retry; a chunked load resumes where it stopped
+        sys.exit(1)
     logging.info("Staging ingestion completed")
 
 # --------------------------------------------------
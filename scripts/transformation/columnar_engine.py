@@ -0,0 +1,373 @@
+# pragma: no cover
+
+import os
+import csv
+import json
+import time
+import argparse
+import logging
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import yaml
+
+# --------------------------------------------------
+# Paths & Config
+# --------------------------------------------------
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+CONFIG_PATH = os.path.join(BASE_DIR, "config", "config.yaml")
+RAW_DATA_DIR = os.path.join(BASE_DIR, "data", "raw")
+OUTPUT_DIR = os.path.join(BASE_DIR, "data", "columnar")
+SUMMARY_DIR = os.path.join(BASE_DIR, "data", "production")
+LOG_DIR = os.path.join(BASE_DIR, "logs")
+
+os.makedirs(LOG_DIR, exist_ok=True)
+os.makedirs(SUMMARY_DIR, exist_ok=True)
+
+# --------------------------------------------------
+# Logging
+# --------------------------------------------------
+log_file = os.path.join(
+    LOG_DIR, f"columnar_engine_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    handlers=[logging.FileHandler(log_file), logging.StreamHandler()],
+)
+
+# --------------------------------------------------
+# Load config
+# --------------------------------------------------
+with open(CONFIG_PATH, "r") as f:
+    config = yaml.safe_load(f)
+
+RAW_FORMAT = config.get("raw_data", {}).get("format", "csv")
+
+RAW_SUFFIXES = {
+    "csv": (".csv", ".csv.gz", ".csv.zst"),
+    "parquet": (".parquet",),
+}
+
+RAW_FILES = ("customers", "products", "transactions", "transaction_items")
+
+# Typed columns; everything else is read as text, like the staging VARCHARs
+MONEY_COLUMNS = {
+    "products": ("price", "cost"),
+    "transactions": ("total_amount",),
+    "transaction_items": ("unit_price", "discount_percentage", "line_total"),
+}
+INTEGER_COLUMNS = {
+    "products": ("stock_quantity",),
+    "transaction_items": ("quantity",),
+}
+DATE_COLUMNS = {
+    "customers": ("registration_date",),
+    "transactions": ("transaction_date",),
+}
+
+# --------------------------------------------------
+# Exact decimal arithmetic
+# Money is held as int64 cents so every ROUND matches Postgres NUMERIC
+# (half away from zero) instead of float64 / numpy's half-to-even
+# --------------------------------------------------
+def to_units(values, scale=2):
+    """Decimal column → nullable int64 units of 10**-scale, rounded as COPY into DECIMAL(_, scale)."""
+    scaled = pd.to_numeric(values) * 10 ** scale
+    return (np.sign(scaled) * np.floor(scaled.abs() + 0.5)).astype("Int64")
+
+
+def round_half_away(numerator, denominator):
+    """numerator / denominator on integer columns, rounded half away from zero."""
+    rounded = (2 * numerator.abs() + denominator) // (2 * denominator)
+    return rounded * np.sign(numerator)
+
+
+def from_units(units, scale=2):
+    return units.astype("Float64") / 10 ** scale
+
+# --------------------------------------------------
+# Postgres text functions
+# --------------------------------------------------
+def pg_trim(values):
+    # TRIM() strips spaces only, not tabs or newlines
+    return values.str.strip(" ")
+
+
+def pg_initcap(values):
+    # INITCAP(): words are runs of letters/digits; first upper, rest lower
+    return values.str.replace(
+        r"[^\W_]+", lambda m: m.group(0)[:1].upper() + m.group(0)[1:].lower(), regex=True
+    )
+
+# --------------------------------------------------
+# Raw input
+# --------------------------------------------------
+def resolve_raw_file(name, raw_dir=RAW_DATA_DIR):
+    candidates = [os.path.join(raw_dir, name + suffix) for suffix in RAW_SUFFIXES[RAW_FORMAT]]
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        raise FileNotFoundError(f"Missing raw file: {name} ({', '.join(RAW_SUFFIXES[RAW_FORMAT])})")
+    return max(existing, key=os.path.getmtime)
+
+
+def csv_header(path):
+    # pa.input_stream detects .gz/.zst from the suffix
+    with pa.input_stream(path) as stream:
+        first_line = stream.read(1 << 16).split(b"\n", 1)[0].decode().rstrip("\r")
+    return next(csv.reader([first_line]))
+
+
+def read_raw(name, raw_dir=RAW_DATA_DIR):
+    """Read one raw file the way COPY lands it in staging: text columns, decimals in exact units."""
+    path = resolve_raw_file(name, raw_dir)
+    if path.endswith(".parquet"):
+        df = pq.read_table(path).to_pandas()
+    else:
+        # All text, unquoted empty fields NULL, as with COPY ... CSV into staging
+        df = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                column_types={column: pa.string() for column in csv_header(path)},
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,
+            ),
+        ).to_pandas()
+
+    for column in MONEY_COLUMNS.get(name, ()):
+        df[column] = to_units(df[column])
+    for column in INTEGER_COLUMNS.get(name, ()):
+        df[column] = pd.to_numeric(df[column]).astype("Int64")
+    for column in DATE_COLUMNS.get(name, ()):
+        df[column] = pd.to_datetime(df[column]).dt.date
+    return df
+
+# --------------------------------------------------
+# Staging → production transforms
+# --------------------------------------------------
+def transform_customers(customers):
+    df = customers[customers["email"].notna()]
+    return pd.DataFrame({
+        "customer_id": df["customer_id"],
+        "first_name": pg_initcap(pg_trim(df["first_name"])),
+        "last_name": pg_initcap(pg_trim(df["last_name"])),
+        "email": pg_trim(df["email"]).str.lower(),
+        "phone": df["phone"].str.replace(r"[^0-9]", "", regex=True),
+        "registration_date": df["registration_date"],
+        "city": pg_trim(df["city"]),
+        "state": pg_trim(df["state"]),
+        "country": pg_trim(df["country"]),
+        "age_group": pg_trim(df["age_group"]),
+    })
+
+
+def transform_products(products):
+    price, cost = products["price"], products["cost"]
+    df = products[((price > 0) & (cost >= 0) & (cost < price)).fillna(False)]
+    price, cost = df["price"], df["cost"]
+    return pd.DataFrame({
+        "product_id": df["product_id"],
+        "product_name": pg_trim(df["product_name"]),
+        "category": pg_trim(df["category"]),
+        "sub_category": pg_trim(df["sub_category"]),
+        "price": price,
+        "cost": cost,
+        "brand": pg_trim(df["brand"]),
+        "stock_quantity": df["stock_quantity"],
+        "supplier_id": df["supplier_id"],
+        # ROUND(((price - cost) / price) * 100, 2), in hundredths of a percent
+        "profit_margin": round_half_away((price - cost) * 10000, price),
+        "price_category": np.select(
+            [price < 5000, price < 20000], ["Budget", "Mid-range"], "Premium"
+        ),
+    })
+
+
+def transform_transactions(transactions):
+    df = transactions[(transactions["total_amount"] > 0).fillna(False)]
+    return pd.DataFrame({
+        "transaction_id": df["transaction_id"],
+        "customer_id": df["customer_id"],
+        "transaction_date": df["transaction_date"],
+        "transaction_time": df["transaction_time"],
+        "payment_method": pg_trim(df["payment_method"]),
+        "shipping_address": pg_trim(df["shipping_address"]),
+        "total_amount": df["total_amount"],
+    })
+
+
+def transform_transaction_items(items):
+    df = items[(items["quantity"] > 0).fillna(False)]
+    quantity, unit_price, discount = df["quantity"], df["unit_price"], df["discount_percentage"]
+    return pd.DataFrame({
+        "item_id": df["item_id"],
+        "transaction_id": df["transaction_id"],
+        "product_id": df["product_id"],
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "discount_percentage": discount,
+        # ROUND(quantity * unit_price * (1 - discount/100), 2) on cents and hundredths of a percent
+        "line_total": round_half_away(quantity * unit_price * (10000 - discount), 10000),
+    })
+
+
+def reconcile_totals(transactions, items):
+    """Replace total_amount with the sum of line_total for transactions that have items."""
+    totals = items.groupby("transaction_id")["line_total"].sum()
+    reconciled = transactions["transaction_id"].map(totals)
+    return transactions.assign(
+        total_amount=reconciled.fillna(transactions["total_amount"]).astype("Int64")
+    )
+
+# --------------------------------------------------
+# Warehouse facts and aggregates
+# --------------------------------------------------
+def build_fact_sales(transactions, items, products, customers):
+    """fact_sales rows keyed by business IDs (surrogate keys are assigned by the warehouse)."""
+    facts = items.merge(
+        transactions[["transaction_id", "customer_id", "transaction_date", "payment_method"]],
+        on="transaction_id"
+    ).merge(products[["product_id", "cost"]], on="product_id")
+    facts = facts[
+        facts["customer_id"].isin(customers["customer_id"]) & facts["payment_method"].notna()
+    ]
+
+    quantity, unit_price = facts["quantity"], facts["unit_price"]
+    return pd.DataFrame({
+        "date_key": pd.to_datetime(facts["transaction_date"]).dt.strftime("%Y%m%d").astype(int),
+        "customer_id": facts["customer_id"],
+        "product_id": facts["product_id"],
+        "payment_method": facts["payment_method"],
+        "transaction_id": facts["transaction_id"],
+        "item_id": facts["item_id"],
+        "quantity": quantity,
+        "unit_price": unit_price,
+        # unit_price * quantity * (discount / 100), stored into DECIMAL(12,2)
+        "discount_amount": round_half_away(
+            unit_price * quantity * facts["discount_percentage"], 10000
+        ),
+        "line_total": facts["line_total"],
+        "profit": facts["line_total"] - facts["cost"] * quantity,
+    })
+
+
+def daily_sales(fact_sales):
+    return fact_sales.groupby("date_key").agg(
+        total_transactions=("transaction_id", "nunique"),
+        total_revenue=("line_total", "sum"),
+        total_profit=("profit", "sum"),
+        unique_customers=("customer_id", "nunique"),
+    ).reset_index()
+
+# --------------------------------------------------
+# Engine
+# --------------------------------------------------
+# Decimal outputs and their scale; everything above works in integer units
+OUTPUT_SCALES = {
+    "products": {"price": 2, "cost": 2, "profit_margin": 2},
+    "transactions": {"total_amount": 2},
+    "transaction_items": {"unit_price": 2, "discount_percentage": 2, "line_total": 2},
+    "fact_sales": {"unit_price": 2, "discount_amount": 2, "line_total": 2, "profit": 2},
+    "agg_daily_sales": {"total_revenue": 2, "total_profit": 2},
+}
+
+
+def timed_step(steps, name, fn, *args):
+    started = time.time()
+    result = fn(*args)
+    seconds = time.time() - started
+    steps[name] = {
+        "seconds": round(seconds, 4),
+        "rows": len(result),
+        "rows_per_second": round(len(result) / seconds) if seconds else None,
+    }
+    return result
+
+
+def run_engine(raw_dir=RAW_DATA_DIR):
+    """Run the production and warehouse transforms in-process; returns ({output: DataFrame}, steps)."""
+    steps = {}
+    raw = {name: timed_step(steps, f"read_{name}", read_raw, name, raw_dir) for name in RAW_FILES}
+
+    customers = timed_step(steps, "customers", transform_customers, raw["customers"])
+    products = timed_step(steps, "products", transform_products, raw["products"])
+    transactions = timed_step(steps, "transactions", transform_transactions, raw["transactions"])
+    items = timed_step(
+        steps, "transaction_items", transform_transaction_items, raw["transaction_items"]
+    )
+    # Production FKs: items only land for transactions that passed their own filter
+    items = items[items["transaction_id"].isin(transactions["transaction_id"])]
+    transactions = timed_step(steps, "reconciliation", reconcile_totals, transactions, items)
+
+    fact_sales = timed_step(
+        steps, "fact_sales", build_fact_sales, transactions, items, products, customers
+    )
+    agg_daily_sales = timed_step(steps, "agg_daily_sales", daily_sales, fact_sales)
+
+    outputs = {
+        "customers": customers,
+        "products": products,
+        "transactions": transactions,
+        "transaction_items": items,
+        "fact_sales": fact_sales,
+        "agg_daily_sales": agg_daily_sales,
+    }
+    for name, scales in OUTPUT_SCALES.items():
+        outputs[name] = outputs[name].assign(
+            **{column: from_units(outputs[name][column], scale) for column, scale in scales.items()}
+        )
+    return {name: df.reset_index(drop=True) for name, df in outputs.items()}, steps
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the ETL and warehouse transforms in-process over the raw files"
+    )
+    parser.add_argument(
+        "--raw-dir", default=RAW_DATA_DIR,
+        help="directory holding the raw customers/products/transactions/transaction_items files"
+    )
+    parser.add_argument(
+        "--output-dir", default=OUTPUT_DIR,
+        help="where the outputs are written as Parquet"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.time()
+
+    outputs, steps = run_engine(args.raw_dir)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name, df in outputs.items():
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False),
+            os.path.join(args.output_dir, f"{name}.parquet")
+        )
+
+    summary = {
+        "engine": "columnar",
+        "run_timestamp": datetime.now(timezone.utc).isoformat(),
+        "raw_format": RAW_FORMAT,
+        "steps": steps,
+        "outputs": {name: len(df) for name, df in outputs.items()},
+        "execution_time_seconds": round(time.time() - start, 2),
+    }
+    summary_path = os.path.join(SUMMARY_DIR, "columnar_summary.json")
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=4)
+
+    logging.info(f"Columnar engine outputs written to {args.output_dir}")
+    logging.info(f"Columnar summary written to {summary_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,183 +1,370 @@
 # pragma: no cover
 
 import os
+import argparse
 import psycopg2
-from datetime import date, timedelta
+import yaml
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+with open(os.path.join(BASE_DIR, "config", "config.yaml"), "r") as f:
+    config = yaml.safe_load(f)
+
+# Days of dim_date generated past the latest transaction
+DATE_HORIZON_DAYS = config.get("warehouse", {}).get("date_horizon_days", 365)
+
+# fact_sales progress, kept next to the production fact watermarks
+FACT_WATERMARK = "warehouse.fact_sales"
 
 # =====================================================
 # DATABASE CONNECTION (ENVIRONMENT-AWARE ✅)
 # =====================================================
-conn = psycopg2.connect(
-    host=os.getenv("DB_HOST", "localhost"),
-    port=int(os.getenv("DB_PORT", 5432)),
-    dbname=os.getenv("DB_NAME", "ecommerce_db"),
-    user=os.getenv("DB_USER", "admin"),
-    password=os.getenv("DB_PASSWORD", "password")
-)
+def get_connection():
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", 5432)),
+        dbname=os.getenv("DB_NAME", "ecommerce_db"),
+        user=os.getenv("DB_USER", "admin"),
+        password=os.getenv("DB_PASSWORD", "password")
+    )
 
-cur = conn.cursor()
+# =====================================================
+# DIM DATE (SET-BASED, DATA-DRIVEN RANGE)
+# =====================================================
+def load_dim_date(cur):
+    # Covers the first transaction date through the last one plus the horizon;
+    # only dates outside the range already loaded are generated
+    cur.execute("""
+    WITH bounds AS (
+        SELECT MIN(transaction_date) AS first_date,
+               MAX(transaction_date) + %s AS last_date
+        FROM production.transactions
+    ),
+    loaded AS (
+        SELECT MIN(full_date) AS first_date, MAX(full_date) AS last_date
+        FROM warehouse.dim_date
+    ),
+    days AS (
+        SELECT g::date AS d
+        FROM bounds, loaded,
+             generate_series(bounds.first_date, bounds.last_date, INTERVAL '1 day') AS g
+        WHERE loaded.first_date IS NULL
+           OR g::date < loaded.first_date
+           OR g::date > loaded.last_date
+    )
+    INSERT INTO warehouse.dim_date
+    (date_key, full_date, year, quarter, month, day,
+     month_name, day_name, week_of_year, is_weekend)
+    SELECT
+        TO_CHAR(d, 'YYYYMMDD')::INT,
+        d,
+        EXTRACT(YEAR FROM d)::INT,
+        EXTRACT(QUARTER FROM d)::INT,
+        EXTRACT(MONTH FROM d)::INT,
+        EXTRACT(DAY FROM d)::INT,
+        TO_CHAR(d, 'FMMonth'),
+        TO_CHAR(d, 'FMDay'),
+        -- strftime('%%W'): Monday-based week, days before the first Monday are week 0
+        (EXTRACT(DOY FROM d)::INT + 7 - EXTRACT(ISODOW FROM d)::INT) / 7,
+        EXTRACT(ISODOW FROM d) >= 6
+    FROM days
+    ON CONFLICT (date_key) DO NOTHING
+    """, (DATE_HORIZON_DAYS,))
 
-print("Loading warehouse...")
+    print(f"dim_date: {cur.rowcount} dates added")
 
 # =====================================================
-# DIM DATE (IDEMPOTENT)
+# FULL REFRESH (ON DEMAND)
 # =====================================================
-start = date(2024, 1, 1)
-end = date(2024, 12, 31)
-d = start
+def truncate_warehouse(cur):
+    cur.execute("""
+    TRUNCATE
+        warehouse.fact_sales,
+        warehouse.agg_daily_sales,
+        warehouse.agg_product_performance,
+        warehouse.agg_customer_metrics,
+        warehouse.dim_customers,
+        warehouse.dim_products
+    CASCADE
+    """)
 
-while d <= end:
+    # Facts are gone, so earlier duplicate payment methods can be collapsed
     cur.execute("""
-        INSERT INTO warehouse.dim_date
-        (date_key, full_date, year, quarter, month, day,
-         month_name, day_name, week_of_year, is_weekend)
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-        ON CONFLICT (date_key) DO NOTHING
-    """, (
-        int(d.strftime("%Y%m%d")),
-        d,
-        d.year,
-        (d.month - 1) // 3 + 1,
-        d.month,
-        d.day,
-        d.strftime("%B"),
-        d.strftime("%A"),
-        int(d.strftime("%W")),
-        d.weekday() >= 5
-    ))
-    d += timedelta(days=1)
+    DELETE FROM warehouse.dim_payment_method d
+    USING warehouse.dim_payment_method keep
+    WHERE d.payment_method_name = keep.payment_method_name
+      AND d.payment_method_key > keep.payment_method_key
+    """)
+
+    print("Warehouse truncated for a full refresh")
+
+
+def needs_full_refresh(cur):
+    # Facts loaded before item_id was tracked cannot be appended to safely
+    cur.execute("SELECT EXISTS (SELECT 1 FROM warehouse.fact_sales WHERE item_id IS NULL)")
+    return cur.fetchone()[0]
 
 # =====================================================
 # DIM PAYMENT METHOD
 # =====================================================
-cur.execute("""
-INSERT INTO warehouse.dim_payment_method (payment_method_name, payment_type)
-SELECT DISTINCT payment_method,
-       CASE
-           WHEN payment_method = 'Cash on Delivery'
-           THEN 'Offline'
-           ELSE 'Online'
-       END
-FROM production.transactions
-ON CONFLICT DO NOTHING
-""")
-
-# =====================================================
-# TRUNCATE TABLES (SAFE ORDER ✅)
-# =====================================================
-# =========================
-# TRUNCATE ALL WAREHOUSE TABLES (FK-SAFE)
-# =========================
-cur.execute("""
-TRUNCATE
-    warehouse.fact_sales,
-    warehouse.agg_daily_sales,
-    warehouse.agg_product_performance,
-    warehouse.agg_customer_metrics,
-    warehouse.dim_customers,
-    warehouse.dim_products
-CASCADE
-""")
-
-# =====================================================
-# DIM CUSTOMERS (SCD TYPE 2 - SIMPLIFIED)
-# =====================================================
-cur.execute("""
-INSERT INTO warehouse.dim_customers
-(customer_id, full_name, email, city, state, country, age_group,
- customer_segment, registration_date, effective_date, end_date, is_current)
-SELECT
-    c.customer_id,
-    c.first_name || ' ' || c.last_name,
-    c.email,
-    c.city,
-    c.state,
-    c.country,
-    c.age_group,
-    'Regular',
-    c.registration_date,
-    CURRENT_DATE,
-    NULL,
-    TRUE
-FROM production.customers c
-""")
-
-# =====================================================
-# DIM PRODUCTS (SCD TYPE 2 - SIMPLIFIED)
-# =====================================================
-cur.execute("""
-INSERT INTO warehouse.dim_products
-(product_id, product_name, category, sub_category, brand,
- price_range, effective_date, end_date, is_current)
-SELECT
-    p.product_id,
-    p.product_name,
-    p.category,
-    p.sub_category,
-    p.brand,
-    p.price_category,
-    CURRENT_DATE,
-    NULL,
-    TRUE
-FROM production.products p
-""")
-
-# =====================================================
-# FACT SALES (REBUILT FULLY)
-# =====================================================
-cur.execute("""
-INSERT INTO warehouse.fact_sales
-(date_key, customer_key, product_key, payment_method_key,
- transaction_id, quantity, unit_price,
- discount_amount, line_total, profit)
-SELECT
-    dd.date_key,
-    dc.customer_key,
-    dp.product_key,
-    pm.payment_method_key,
-    ti.transaction_id,
-    ti.quantity,
-    ti.unit_price,
-    (ti.unit_price * ti.quantity * (ti.discount_percentage / 100)),
-    ti.line_total,
-    ti.line_total - (p.cost * ti.quantity)
-FROM production.transaction_items ti
-JOIN production.transactions t
-    ON ti.transaction_id = t.transaction_id
-JOIN production.products p
-    ON ti.product_id = p.product_id
-JOIN warehouse.dim_date dd
-    ON dd.full_date = t.transaction_date
-JOIN warehouse.dim_customers dc
-    ON dc.customer_id = t.customer_id
-   AND dc.is_current = TRUE
-JOIN warehouse.dim_products dp
-    ON dp.product_id = ti.product_id
-   AND dp.is_current = TRUE
-JOIN warehouse.dim_payment_method pm
-    ON pm.payment_method_name = t.payment_method
-""")
-
-# =====================================================
-# AGGREGATES
-# =====================================================
-cur.execute("""
-INSERT INTO warehouse.agg_daily_sales
-SELECT
-    date_key,
-    COUNT(DISTINCT transaction_id),
-    SUM(line_total),
-    SUM(profit),
-    COUNT(DISTINCT customer_key)
-FROM warehouse.fact_sales
-GROUP BY date_key
-""")
-
-# =====================================================
-# COMMIT & CLEANUP
-# =====================================================
-conn.commit()
-cur.close()
-conn.close()
-
-print("Warehouse load completed successfully")
+def load_dim_payment_method(cur):
+    cur.execute("""
+    INSERT INTO warehouse.dim_payment_method (payment_method_name, payment_type)
+    SELECT DISTINCT payment_method,
+           CASE
+               WHEN payment_method = 'Cash on Delivery'
+               THEN 'Offline'
+               ELSE 'Online'
+           END
+    FROM production.transactions t
+    WHERE NOT EXISTS (
+        SELECT 1 FROM warehouse.dim_payment_method pm
+        WHERE pm.payment_method_name = t.payment_method
+    )
+    """)
+
+# =====================================================
+# DIM CUSTOMERS / DIM PRODUCTS (SCD TYPE 2, HASH-DIFF MERGE)
+# =====================================================
+# Tracked attributes of each dimension and the production expression feeding them
+CUSTOMER_ATTRIBUTES = {
+    "full_name": "c.first_name || ' ' || c.last_name",
+    "email": "c.email",
+    "city": "c.city",
+    "state": "c.state",
+    "country": "c.country",
+    "age_group": "c.age_group",
+    "registration_date": "c.registration_date",
+}
+
+PRODUCT_ATTRIBUTES = {
+    "product_name": "p.product_name",
+    "category": "p.category",
+    "sub_category": "p.sub_category",
+    "brand": "p.brand",
+    "price_range": "p.price_category",
+}
+
+# First versions reach back far enough for every historical fact to find one
+FIRST_EFFECTIVE_DATE = "1900-01-01"
+
+
+def merge_scd2(cur, dimension, key, source, attributes, constants=None):
+    """Close changed current versions and insert new ones; unchanged members are not touched."""
+    constants = constants or {}
+    columns = list(attributes)
+    expressions = ", ".join(attributes.values())
+    src = f"""
+        SELECT {key} AS {key},
+               {", ".join(f"{expression} AS {column}" for column, expression in attributes.items())},
+               md5(ROW({expressions})::text) AS row_hash
+        {source}
+    """
+
+    # Versions loaded before row_hash existed become hashed first versions
+    cur.execute(f"""
+    UPDATE warehouse.{dimension}
+    SET row_hash = md5(ROW({", ".join(columns)})::text),
+        effective_date = %s
+    WHERE row_hash IS NULL
+    """, (FIRST_EFFECTIVE_DATE,))
+
+    cur.execute(f"""
+    UPDATE warehouse.{dimension} d
+    SET end_date = CURRENT_DATE - 1,
+        is_current = FALSE
+    FROM ({src}) s
+    WHERE d.{key} = s.{key}
+      AND d.is_current = TRUE
+      AND d.row_hash <> s.row_hash
+    """)
+    closed = cur.rowcount
+
+    # Members with no current version: brand new (first version) or just closed (starts today)
+    cur.execute(f"""
+    INSERT INTO warehouse.{dimension}
+    ({key}, {", ".join(columns + list(constants))}, row_hash, effective_date, end_date, is_current)
+    SELECT
+        s.{key},
+        {", ".join([f"s.{column}" for column in columns] + ["%s"] * len(constants))},
+        s.row_hash,
+        CASE
+            WHEN EXISTS (SELECT 1 FROM warehouse.{dimension} o WHERE o.{key} = s.{key})
+            THEN CURRENT_DATE
+            ELSE %s::DATE
+        END,
+        NULL,
+        TRUE
+    FROM ({src}) s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM warehouse.{dimension} d
+        WHERE d.{key} = s.{key} AND d.is_current = TRUE
+    )
+    """, (*constants.values(), FIRST_EFFECTIVE_DATE))
+    inserted = cur.rowcount
+
+    print(f"{dimension}: {inserted - closed} members added, {closed} new versions")
+
+
+def load_dim_customers(cur):
+    merge_scd2(
+        cur, "dim_customers", "customer_id", "FROM production.customers c",
+        CUSTOMER_ATTRIBUTES, constants={"customer_segment": "Regular"}
+    )
+
+
+def load_dim_products(cur):
+    merge_scd2(cur, "dim_products", "product_id", "FROM production.products p", PRODUCT_ATTRIBUTES)
+
+# =====================================================
+# FACT SALES (INCREMENTAL APPEND)
+# =====================================================
+def read_fact_watermark(cur):
+    # An empty fact table (first load or full refresh) reads every item
+    cur.execute("SELECT EXISTS (SELECT 1 FROM warehouse.fact_sales)")
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute(
+        "SELECT watermark FROM production.etl_watermarks WHERE table_name = %s",
+        (FACT_WATERMARK,)
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def load_fact_sales(cur):
+    """Append production items created after the watermark; returns (rows added, touched date_keys)."""
+    watermark = read_fact_watermark(cur)
+
+    cur.execute("""
+    WITH items AS (
+        SELECT * FROM production.transaction_items
+        WHERE created_at > COALESCE(%s, '-infinity'::timestamp)
+    ),
+    ins AS (
+        INSERT INTO warehouse.fact_sales
+        (date_key, customer_key, product_key, payment_method_key,
+         transaction_id, item_id, quantity, unit_price,
+         discount_amount, line_total, profit)
+        SELECT
+            dd.date_key,
+            dc.customer_key,
+            dp.product_key,
+            pm.payment_method_key,
+            ti.transaction_id,
+            ti.item_id,
+            ti.quantity,
+            ti.unit_price,
+            (ti.unit_price * ti.quantity * (ti.discount_percentage / 100)),
+            ti.line_total,
+            ti.line_total - (p.cost * ti.quantity)
+        FROM items ti
+        JOIN production.transactions t
+            ON ti.transaction_id = t.transaction_id
+        JOIN production.products p
+            ON ti.product_id = p.product_id
+        JOIN warehouse.dim_date dd
+            ON dd.full_date = t.transaction_date
+        -- Dimension versions valid on the transaction date
+        JOIN warehouse.dim_customers dc
+            ON dc.customer_id = t.customer_id
+           AND t.transaction_date >= dc.effective_date
+           AND (dc.end_date IS NULL OR t.transaction_date <= dc.end_date)
+        JOIN warehouse.dim_products dp
+            ON dp.product_id = ti.product_id
+           AND t.transaction_date >= dp.effective_date
+           AND (dp.end_date IS NULL OR t.transaction_date <= dp.end_date)
+        JOIN warehouse.dim_payment_method pm
+            ON pm.payment_method_name = t.payment_method
+        ON CONFLICT (item_id) DO NOTHING
+        RETURNING date_key
+    )
+    SELECT
+        (SELECT COUNT(*) FROM ins),
+        (SELECT ARRAY_AGG(DISTINCT date_key) FROM ins),
+        (SELECT MAX(created_at) FROM items)
+    """, (watermark,))
+    added, date_keys, new_watermark = cur.fetchone()
+
+    if new_watermark is not None:
+        cur.execute("""
+        INSERT INTO production.etl_watermarks (table_name, watermark, rows_loaded, updated_at)
+        VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+        ON CONFLICT (table_name) DO UPDATE SET
+            watermark = GREATEST(production.etl_watermarks.watermark, EXCLUDED.watermark),
+            rows_loaded = EXCLUDED.rows_loaded,
+            updated_at = EXCLUDED.updated_at
+        """, (FACT_WATERMARK, new_watermark, added))
+
+    print(f"fact_sales: {added} rows appended")
+    return added, date_keys or []
+
+# =====================================================
+# AGGREGATES (DATES TOUCHED BY THIS LOAD)
+# =====================================================
+def refresh_daily_sales(cur, date_keys):
+    if not date_keys:
+        return
+    cur.execute("DELETE FROM warehouse.agg_daily_sales WHERE date_key = ANY(%s)", (date_keys,))
+    cur.execute("""
+    INSERT INTO warehouse.agg_daily_sales
+    SELECT
+        date_key,
+        COUNT(DISTINCT transaction_id),
+        SUM(line_total),
+        SUM(profit),
+        COUNT(DISTINCT customer_key)
+    FROM warehouse.fact_sales
+    WHERE date_key = ANY(%s)
+    GROUP BY date_key
+    """, (date_keys,))
+    print(f"agg_daily_sales: {len(date_keys)} days refreshed")
+
+# =====================================================
+# MAIN
+# =====================================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load the warehouse star schema from production")
+    parser.add_argument(
+        "--full-refresh", action="store_true",
+        help="truncate facts, aggregates and dimensions and rebuild them (new surrogate keys)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = get_connection()
+    cur = conn.cursor()
+
+    print("Loading warehouse...")
+
+    try:
+        load_dim_date(cur)
+
+        if args.full_refresh or needs_full_refresh(cur):
+            truncate_warehouse(cur)
+
+        load_dim_payment_method(cur)
+        load_dim_customers(cur)
+        load_dim_products(cur)
+
+        added, date_keys = load_fact_sales(cur)
+        refresh_daily_sales(cur, date_keys)
+
+        # =====================================================
+        # COMMIT & CLEANUP
+        # =====================================================
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+    print("Warehouse load completed successfully")
+
+
+if __name__ == "__main__":
+    main()
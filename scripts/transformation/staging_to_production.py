@@ -3,10 +3,13 @@
 import os
 import json
 import time
+import argparse
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 
 import psycopg2
+import psycopg2.pool
 import yaml
 
 # --------------------------------------------------
@@ -48,21 +51,498 @@ DB_CONFIG = {
     "password": os.getenv("DB_PASSWORD", config["database"]["password"]),
 }
 
+TRANSFORM_CONFIG = config.get("transformation", {})
+BATCH_SIZE = config.get("pipeline", {}).get("batch_size", 1000)
+
 # --------------------------------------------------
 # DB connection
 # --------------------------------------------------
 def get_connection():
     return psycopg2.connect(**DB_CONFIG)
 
+# --------------------------------------------------
+# Incremental watermarks (staging.loaded_at)
+# --------------------------------------------------
+def read_watermark(cur, target_table):
+    # An empty target (first run, or a manual reset) must be rebuilt from all of
+    # staging, whatever the stored watermark says
+    cur.execute(f"SELECT EXISTS (SELECT 1 FROM {target_table})")
+    if not cur.fetchone()[0]:
+        return None
+
+    cur.execute(
+        "SELECT watermark FROM production.etl_watermarks WHERE table_name = %s",
+        (target_table,)
+    )
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def advance_watermark(cur, target_table, watermark, rows_loaded):
+    # Committed with the inserts it covers, so a failed run leaves it untouched
+    if watermark is None:
+        return
+    cur.execute("""
+        INSERT INTO production.etl_watermarks (table_name, watermark, rows_loaded, updated_at)
+        VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+        ON CONFLICT (table_name) DO UPDATE SET
+            watermark = GREATEST(production.etl_watermarks.watermark, EXCLUDED.watermark),
+            rows_loaded = EXCLUDED.rows_loaded,
+            updated_at = EXCLUDED.updated_at
+    """, (target_table, watermark, rows_loaded))
+
+# --------------------------------------------------
+# Step definitions
+# Each transform reads one step's staging rows from `batch` and returns the
+# production columns; dimensions add an md5 row_hash of those columns
+# --------------------------------------------------
+CUSTOMERS_TRANSFORM = """
+    SELECT c.*, md5(c::text) AS row_hash
+    FROM (
+        SELECT
+            customer_id,
+            INITCAP(TRIM(first_name)) AS first_name,
+            INITCAP(TRIM(last_name)) AS last_name,
+            LOWER(TRIM(email)) AS email,
+            REGEXP_REPLACE(phone, '[^0-9]', '', 'g') AS phone,
+            registration_date,
+            TRIM(city) AS city,
+            TRIM(state) AS state,
+            TRIM(country) AS country,
+            TRIM(age_group) AS age_group
+        FROM batch
+        WHERE email IS NOT NULL
+    ) c
+"""
+
+PRODUCTS_TRANSFORM = """
+    SELECT p.*, md5(p::text) AS row_hash
+    FROM (
+        SELECT
+            product_id,
+            TRIM(product_name) AS product_name,
+            TRIM(category) AS category,
+            TRIM(sub_category) AS sub_category,
+            ROUND(price, 2) AS price,
+            ROUND(cost, 2) AS cost,
+            TRIM(brand) AS brand,
+            stock_quantity,
+            supplier_id,
+            ROUND(((price - cost) / price) * 100, 2) AS profit_margin,
+            CASE
+                WHEN price < 50 THEN 'Budget'
+                WHEN price < 200 THEN 'Mid-range'
+                ELSE 'Premium'
+            END AS price_category
+        FROM batch
+        WHERE price > 0 AND cost >= 0 AND cost < price
+    ) p
+"""
+
+TRANSACTIONS_TRANSFORM = """
+    SELECT
+        transaction_id,
+        customer_id,
+        transaction_date,
+        transaction_time,
+        TRIM(payment_method) AS payment_method,
+        TRIM(shipping_address) AS shipping_address,
+        ROUND(total_amount, 2) AS total_amount
+    FROM batch
+    WHERE total_amount > 0
+"""
+
+TRANSACTION_ITEMS_TRANSFORM = """
+    SELECT
+        item_id,
+        transaction_id,
+        product_id,
+        quantity,
+        ROUND(unit_price, 2) AS unit_price,
+        ROUND(discount_percentage, 2) AS discount_percentage,
+        ROUND(quantity * unit_price * (1 - discount_percentage/100), 2) AS line_total
+    FROM batch
+    WHERE quantity > 0
+"""
+
+# Dimensions are upserted on row_hash change; facts are insert-only past their watermark
+STEPS = {
+    "customers": {
+        "key": "customer_id",
+        "transform": CUSTOMERS_TRANSFORM,
+        "columns": [
+            "customer_id", "first_name", "last_name", "email", "phone",
+            "registration_date", "city", "state", "country", "age_group", "row_hash"
+        ],
+        "fact": False,
+    },
+    "products": {
+        "key": "product_id",
+        "transform": PRODUCTS_TRANSFORM,
+        "columns": [
+            "product_id", "product_name", "category", "sub_category",
+            "price", "cost", "brand", "stock_quantity", "supplier_id",
+            "profit_margin", "price_category", "row_hash"
+        ],
+        "fact": False,
+    },
+    "transactions": {
+        "key": "transaction_id",
+        "transform": TRANSACTIONS_TRANSFORM,
+        "columns": [
+            "transaction_id", "customer_id", "transaction_date",
+            "transaction_time", "payment_method", "shipping_address", "total_amount"
+        ],
+        "fact": True,
+        "rule": "total_amount<=0",
+    },
+    "transaction_items": {
+        "key": "item_id",
+        "transform": TRANSACTION_ITEMS_TRANSFORM,
+        "columns": [
+            "item_id", "transaction_id", "product_id",
+            "quantity", "unit_price", "discount_percentage", "line_total"
+        ],
+        "fact": True,
+        "rule": "quantity<=0",
+    },
+}
+
+WORK_SCHEMA = "production_work"
+
+
+def batch_sql(table, batch=""):
+    # Staging rows of one step: facts only past the watermark, all in key order after %(after)s
+    step = STEPS[table]
+    watermark = (
+        "loaded_at > COALESCE(%(watermark)s, '-infinity'::timestamp) AND "
+        if step["fact"] else ""
+    )
+    return f"""
+        SELECT * FROM staging.{table}
+        WHERE {watermark}{step['key']} > %(after)s
+        {batch}
+    """
+
+
+def apply_sql(table):
+    # Write `src` into production; RETURNING feeds the counts and touched_transactions
+    step = STEPS[table]
+    columns = ", ".join(step["columns"])
+    if step["fact"]:
+        conflict = "DO NOTHING"
+        returning = "(xmax = 0) AS inserted, transaction_id"
+    else:
+        updates = ",\n                ".join(
+            f"{column} = EXCLUDED.{column}" for column in step["columns"] if column != step["key"]
+        )
+        conflict = f"""DO UPDATE SET
+                {updates},
+                updated_at = CURRENT_TIMESTAMP
+            WHERE production.{table}.row_hash IS DISTINCT FROM EXCLUDED.row_hash"""
+        returning = "(xmax = 0) AS inserted"
+
+    statement = f"""
+        up AS (
+            INSERT INTO production.{table} ({columns})
+            SELECT {columns} FROM src
+            ON CONFLICT ({step['key']}) {conflict}
+            RETURNING {returning}
+        )"""
+    if step["fact"]:
+        statement += """,
+        touched AS (
+            INSERT INTO touched_transactions
+            SELECT DISTINCT transaction_id FROM up
+            ON CONFLICT DO NOTHING
+        )"""
+    return statement
+
+
+def step_sql(table, batch=""):
+    """One statement running a step over a keyset batch of staging rows."""
+    # Returns (rows read, last key, rows kept by the transform, inserted, updated, max loaded_at)
+    step = STEPS[table]
+    return f"""
+        WITH batch AS ({batch_sql(table, batch)}),
+        src AS ({step['transform']}),
+        {apply_sql(table)}
+        SELECT
+            (SELECT COUNT(*) FROM batch),
+            (SELECT MAX({step['key']}) FROM batch),
+            (SELECT COUNT(*) FROM src),
+            (SELECT COUNT(*) FROM up WHERE inserted),
+            (SELECT COUNT(*) FROM up WHERE NOT inserted),
+            (SELECT MAX(loaded_at) FROM batch)
+    """
+
+
+def step_counts(table, results):
+    """Summary counts from per-batch (rows read, kept, inserted, updated, max loaded_at)."""
+    step = STEPS[table]
+    input_rows, kept, inserted, updated = (
+        (sum(col) for col in zip(*(r[:4] for r in results))) if results else (0,) * 4
+    )
+    watermark = max((r[4] for r in results if r[4] is not None), default=None)
+
+    counts = {"input": input_rows, "output": inserted + updated, "filtered": input_rows - kept}
+    if step["fact"]:
+        counts["already_loaded"] = kept - inserted
+        counts["rejected_reasons"] = {step["rule"]: counts["filtered"]}
+    else:
+        counts.update(inserted=inserted, updated=updated, unchanged=kept - inserted - updated)
+        counts["rejected_reasons"] = {}
+    return counts, watermark
+
+# --------------------------------------------------
+# Keyset batches (pipeline.batch_size)
+# --------------------------------------------------
+def run_keyset_batches(conn, cur, table, statement, params, batch_options, reconciliation):
+    """Run a step statement over staging in primary-key order; returns each batch's counts."""
+    results, after, processed, started = [], "", 0, time.time()
+    while True:
+        cur.execute(statement, {**params, "after": after, "limit": batch_options["batch_size"]})
+        batch_rows, last_key, *counts = cur.fetchone()
+        if batch_rows:
+            results.append((batch_rows, *counts))
+            processed += batch_rows
+
+        if batch_options["commit_per_batch"]:
+            # Reconcile what this batch touched so every commit leaves consistent totals
+            reconcile_totals(cur, reconciliation)
+            conn.commit()
+
+        if not batch_options["batched"] or batch_rows < batch_options["batch_size"]:
+            break
+        after = last_key
+        elapsed = time.time() - started
+        logging.info(
+            f"{table}: {processed} rows in {len(results)} batches "
+            f"({processed / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
+    logging.info(f"{table}: {processed} staging rows processed in {time.time() - started:.2f}s")
+    return results
+
+# --------------------------------------------------
+# Steps
+# --------------------------------------------------
+def load_step(conn, cur, table, batch_options, reconciliation):
+    """Apply one step from staging on the ETL connection, in keyset batches when batching."""
+    step = STEPS[table]
+    target = f"production.{table}"
+    watermark = read_watermark(cur, target) if step["fact"] else None
+
+    batch = f"ORDER BY {step['key']} LIMIT %(limit)s" if batch_options["batched"] else ""
+    results = run_keyset_batches(
+        conn, cur, table, step_sql(table, batch), {"watermark": watermark},
+        batch_options, reconciliation
+    )
+    counts, new_watermark = step_counts(table, results)
+    if step["fact"]:
+        # Advanced only after every batch, so a run interrupted between
+        # per-batch commits re-reads its rows and ON CONFLICT skips them
+        advance_watermark(cur, target, new_watermark, counts["output"])
+    return counts
+
+# --------------------------------------------------
+# Parallel mode: prepare concurrently, publish atomically
+# --------------------------------------------------
+def run_step_graph(graph, workers):
+    """Run {name: (dependencies, fn)} on a thread pool as soon as each step's dependencies finish."""
+    results, timings, pending, running = {}, {}, dict(graph), {}
+
+    def timed(name, fn):
+        started = time.time()
+        result = fn()
+        logging.info(f"Step {name} finished in {time.time() - started:.2f}s")
+        return result, round(time.time() - started, 2)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name, (dependencies, fn) in list(pending.items()):
+                if all(dependency in results for dependency in dependencies):
+                    running[executor.submit(timed, name, fn)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Unresolvable step dependencies: {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], timings[name] = future.result()
+
+    return results, timings
+
+
+def work_table(table):
+    return f"{WORK_SCHEMA}.{table}"
+
+
+def prepare_step(pool, table):
+    """Transform one step's staging rows into an UNLOGGED work table on a pooled connection."""
+    step = STEPS[table]
+    conn = pool.getconn()
+    try:
+        cur = conn.cursor()
+        watermark = read_watermark(cur, f"production.{table}") if step["fact"] else None
+        params = {"watermark": watermark, "after": ""}
+        work = work_table(table)
+
+        cur.execute(f"DROP TABLE IF EXISTS {work}")
+        cur.execute(
+            f"CREATE UNLOGGED TABLE {work} AS WITH batch AS ({batch_sql(table)}) "
+            f"{step['transform']} WITH NO DATA",
+            params
+        )
+        cur.execute(f"""
+            WITH batch AS ({batch_sql(table)}),
+            src AS ({step['transform']}),
+            ins AS (INSERT INTO {work} SELECT * FROM src RETURNING 1)
+            SELECT
+                (SELECT COUNT(*) FROM batch),
+                (SELECT COUNT(*) FROM ins),
+                (SELECT MAX(loaded_at) FROM batch)
+        """, params)
+        prepared = cur.fetchone()
+        conn.commit()
+        return prepared
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn)
+
+
+def publish_step(cur, table, prepared):
+    """Apply a prepared work table to production inside the publishing transaction."""
+    step = STEPS[table]
+    input_rows, kept, watermark = prepared
+    cur.execute(f"""
+        WITH src AS (SELECT * FROM {work_table(table)}),
+        {apply_sql(table)}
+        SELECT
+            (SELECT COUNT(*) FROM up WHERE inserted),
+            (SELECT COUNT(*) FROM up WHERE NOT inserted)
+    """)
+    inserted, updated = cur.fetchone()
+
+    counts, watermark = step_counts(table, [(input_rows, kept, inserted, updated, watermark)])
+    if step["fact"]:
+        advance_watermark(cur, f"production.{table}", watermark, counts["output"])
+    return counts
+
+
+def drop_work_tables(cur):
+    for table in STEPS:
+        cur.execute(f"DROP TABLE IF EXISTS {work_table(table)}")
+
+
+def prepare_parallel(workers):
+    """Prepare every step concurrently; returns ({table: prepared}, {step: seconds})."""
+    pool = psycopg2.pool.ThreadedConnectionPool(1, workers, **DB_CONFIG)
+    try:
+        graph = {
+            f"prepare_{table}": ((), lambda table=table: prepare_step(pool, table))
+            for table in STEPS
+        }
+        results, timings = run_step_graph(graph, workers)
+    finally:
+        pool.closeall()
+
+    return {table: results[f"prepare_{table}"] for table in STEPS}, timings
+
+def create_touched_table(cur):
+    # Transaction IDs inserted or given new items; reconciliation is scoped to them.
+    # Session-scoped (emptied by each reconcile) so per-batch commits keep it.
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS touched_transactions (
+            transaction_id VARCHAR(20) PRIMARY KEY
+        )
+    """)
+
+
+def reconcile_totals(cur, reconciliation):
+    """Recompute total_amount from line_total for touched transactions, then clear them."""
+    cur.execute("SELECT COUNT(*) FROM touched_transactions")
+    touched = cur.fetchone()[0]
+    if not touched:
+        return
+
+    cur.execute("ANALYZE touched_transactions")
+    cur.execute("""
+        UPDATE production.transactions t
+        SET total_amount = sub.correct_total
+        FROM (
+            SELECT
+                i.transaction_id,
+                ROUND(SUM(i.line_total), 2) AS correct_total
+            FROM touched_transactions tt
+            JOIN production.transaction_items i
+              ON i.transaction_id = tt.transaction_id
+            GROUP BY i.transaction_id
+        ) sub
+        WHERE t.transaction_id = sub.transaction_id
+          AND t.total_amount <> sub.correct_total
+    """)
+    reconciliation["transactions_touched"] += touched
+    reconciliation["totals_corrected"] += cur.rowcount
+    cur.execute("TRUNCATE touched_transactions")
+
 # --------------------------------------------------
 # Main ETL
 # --------------------------------------------------
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transform staging data into the production schema")
+    parser.add_argument(
+        "--batched", action="store_true", default=TRANSFORM_CONFIG.get("batched", False),
+        help="process staging rows in primary-key ordered batches of --batch-size"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE,
+        help="rows per batch with --batched (defaults to pipeline.batch_size)"
+    )
+    parser.add_argument(
+        "--commit-per-batch", action="store_true",
+        default=TRANSFORM_CONFIG.get("commit_per_batch", False),
+        help="commit after every batch instead of once at the end (bounded lock time, not atomic)"
+    )
+    parser.add_argument(
+        "--parallel", action="store_true", default=TRANSFORM_CONFIG.get("parallel", False),
+        help="prepare every step concurrently on pooled connections, then publish in one transaction"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=TRANSFORM_CONFIG.get("max_workers", 4),
+        help="connections used by --parallel"
+    )
+    args = parser.parse_args(argv)
+
+    if args.parallel and args.batched:
+        parser.error("--parallel prepares whole tables; --batched is a separate mode")
+    if args.commit_per_batch and not args.batched:
+        parser.error("--commit-per-batch requires --batched")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be positive")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
     start = time.time()
 
+    batch_options = {
+        "batched": args.batched,
+        "batch_size": args.batch_size,
+        "commit_per_batch": args.commit_per_batch,
+    }
+    reconciliation = {"transactions_touched": 0, "totals_corrected": 0}
+
     summary = {
         "transformation_timestamp": datetime.now(timezone.utc).isoformat(),
+        "mode": "parallel" if args.parallel else "serial",
+        "batching": batch_options,
         "records_processed": {},
+        "steps": {},
         "transformations_applied": [
             "text_normalization",
             "email_standardization",
@@ -84,156 +564,48 @@ def main():
 
     try:
         logging.info("Starting staging → production ETL")
+        create_touched_table(cur)
+        records, steps = summary["records_processed"], summary["steps"]
+
+        if args.parallel:
+            # ==================================================
+            # PREPARE (all steps concurrently into work tables)
+            # ==================================================
+            prepared, timings = prepare_parallel(args.workers)
+            for table in STEPS:
+                steps[f"prepare_{table}"] = {
+                    "seconds": timings[f"prepare_{table}"],
+                    "rows": prepared[table][1],
+                }
 
         # ==================================================
-        # CUSTOMERS (Dimension – Full Reload)
-        # ==================================================
-        cur.execute("TRUNCATE production.customers CASCADE")
-
-        cur.execute("""
-            INSERT INTO production.customers (
-                customer_id, first_name, last_name, email, phone,
-                registration_date, city, state, country, age_group
-            )
-            SELECT
-                customer_id,
-                INITCAP(TRIM(first_name)),
-                INITCAP(TRIM(last_name)),
-                LOWER(TRIM(email)),
-                REGEXP_REPLACE(phone, '[^0-9]', '', 'g'),
-                registration_date,
-                TRIM(city),
-                TRIM(state),
-                TRIM(country),
-                TRIM(age_group)
-            FROM staging.customers
-            WHERE email IS NOT NULL
-        """)
-
-        summary["records_processed"]["customers"] = {
-            "input": cur.rowcount,
-            "output": cur.rowcount,
-            "filtered": 0,
-            "rejected_reasons": {}
-        }
-
-        # ==================================================
-        # PRODUCTS (Dimension – Full Reload)
+        # DIMENSIONS → FACTS (dimensions upserted on row_hash change,
+        # facts incremental past the loaded_at watermark)
         # ==================================================
-        cur.execute("TRUNCATE production.products CASCADE")
-
-        cur.execute("""
-            INSERT INTO production.products (
-                product_id, product_name, category, sub_category,
-                price, cost, brand, stock_quantity, supplier_id,
-                profit_margin, price_category
-            )
-            SELECT
-                product_id,
-                TRIM(product_name),
-                TRIM(category),
-                TRIM(sub_category),
-                ROUND(price, 2),
-                ROUND(cost, 2),
-                TRIM(brand),
-                stock_quantity,
-                supplier_id,
-                ROUND(((price - cost) / price) * 100, 2),
-                CASE
-                    WHEN price < 50 THEN 'Budget'
-                    WHEN price < 200 THEN 'Mid-range'
-                    ELSE 'Premium'
-                END
-            FROM staging.products
-            WHERE price > 0 AND cost >= 0 AND cost < price
-        """)
-
-        summary["records_processed"]["products"] = {
-            "input": cur.rowcount,
-            "output": cur.rowcount,
-            "filtered": 0,
-            "rejected_reasons": {}
-        }
+        for table in STEPS:
+            step_start = time.time()
+            if args.parallel:
+                records[table] = publish_step(cur, table, prepared[table])
+            else:
+                records[table] = load_step(conn, cur, table, batch_options, reconciliation)
+            name = f"publish_{table}" if args.parallel else table
+            steps[name] = {
+                "seconds": round(time.time() - step_start, 2),
+                "rows": records[table]["output"],
+            }
 
         # ==================================================
-        # TRANSACTIONS (Fact – Incremental)
-        # ==================================================
-        cur.execute("""
-            INSERT INTO production.transactions (
-                transaction_id, customer_id, transaction_date,
-                transaction_time, payment_method,
-                shipping_address, total_amount
-            )
-            SELECT
-                t.transaction_id,
-                t.customer_id,
-                t.transaction_date,
-                t.transaction_time,
-                TRIM(t.payment_method),
-                TRIM(t.shipping_address),
-                ROUND(t.total_amount, 2)
-            FROM staging.transactions t
-            LEFT JOIN production.transactions p
-              ON t.transaction_id = p.transaction_id
-            WHERE p.transaction_id IS NULL
-              AND t.total_amount > 0
-        """)
-
-        summary["records_processed"]["transactions"] = {
-            "input": cur.rowcount,
-            "output": cur.rowcount,
-            "filtered": 0,
-            "rejected_reasons": {"total_amount<=0": 0}
-        }
-
-        # ==================================================
-        # TRANSACTION ITEMS (Fact – Incremental)
+        # 🔥 CRITICAL FIX: TRANSACTION TOTAL RECONCILIATION
         # ==================================================
-        cur.execute("""
-            INSERT INTO production.transaction_items (
-                item_id, transaction_id, product_id,
-                quantity, unit_price, discount_percentage, line_total
-            )
-            SELECT
-                i.item_id,
-                i.transaction_id,
-                i.product_id,
-                i.quantity,
-                ROUND(i.unit_price, 2),
-                ROUND(i.discount_percentage, 2),
-                ROUND(i.quantity * i.unit_price * (1 - i.discount_percentage/100), 2)
-            FROM staging.transaction_items i
-            LEFT JOIN production.transaction_items p
-              ON i.item_id = p.item_id
-            WHERE p.item_id IS NULL
-              AND i.quantity > 0
-        """)
-
-        summary["records_processed"]["transaction_items"] = {
-            "input": cur.rowcount,
-            "output": cur.rowcount,
-            "filtered": 0,
-            "rejected_reasons": {"quantity<=0": 0}
+        step_start = time.time()
+        reconcile_totals(cur, reconciliation)
+        summary["reconciliation"] = reconciliation
+        steps["reconciliation"] = {
+            "seconds": round(time.time() - step_start, 2),
+            "rows": reconciliation["totals_corrected"],
         }
 
-        # ==================================================
-        # 🔥 CRITICAL FIX: TRANSACTION TOTAL RECONCILIATION
-        # ==================================================
-        cur.execute("""
-            UPDATE production.transactions t
-            SET total_amount = sub.correct_total
-            FROM (
-                SELECT
-                    transaction_id,
-                    ROUND(SUM(line_total), 2) AS correct_total
-                FROM production.transaction_items
-                GROUP BY transaction_id
-            ) sub
-            WHERE t.transaction_id = sub.transaction_id
-              AND t.total_amount <> sub.correct_total
-        """)
-
-        logging.info("Transaction totals reconciled")
+        logging.info(f"Transaction totals reconciled: {reconciliation['totals_corrected']} corrected")
 
         conn.commit()
         logging.info("ETL committed successfully")
@@ -244,6 +616,9 @@ def main():
         raise
 
     finally:
+        if args.parallel:
+            drop_work_tables(cur)
+            conn.commit()
         cur.close()
         conn.close()
 
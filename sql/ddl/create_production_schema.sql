@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS production.customers (
     state              VARCHAR(100),
     country            VARCHAR(100),
     age_group          VARCHAR(20),
+    row_hash           CHAR(32),
     created_at         TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at         TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -31,11 +32,16 @@ CREATE TABLE IF NOT EXISTS production.products (
     brand            VARCHAR(150),
     stock_quantity   INTEGER NOT NULL CHECK (stock_quantity >= 0),
     supplier_id      VARCHAR(20),
+    row_hash         CHAR(32),
     created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CHECK (cost < price)
 );
 
+-- Change detection for the dimension upserts (existing databases)
+ALTER TABLE production.customers ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+ALTER TABLE production.products ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+
 
 -- =====================================================
 -- PRODUCTION: Transactions
@@ -97,3 +103,22 @@ CREATE INDEX IF NOT EXISTS idx_items_product
 -- Common Query Filters
 CREATE INDEX IF NOT EXISTS idx_transactions_date
     ON production.transactions (transaction_date);
+
+-- Incremental warehouse loads read items created after their watermark
+CREATE INDEX IF NOT EXISTS idx_items_created_at
+    ON production.transaction_items (created_at);
+
+-- =====================================================
+-- PRODUCTION: ETL Watermarks
+-- Purpose: Highest staging loaded_at already applied per
+-- fact table, so each run only reads newer staging rows
+-- =====================================================
+CREATE TABLE IF NOT EXISTS production.etl_watermarks (
+    table_name   VARCHAR(100) PRIMARY KEY,
+    watermark    TIMESTAMP NOT NULL,
+    rows_loaded  BIGINT,
+    updated_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Work tables prepared concurrently by the parallel ETL, dropped after publish
+CREATE SCHEMA IF NOT EXISTS production_work;
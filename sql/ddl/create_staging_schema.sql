@@ -5,6 +5,9 @@ CREATE SCHEMA IF NOT EXISTS staging;
 CREATE SCHEMA IF NOT EXISTS production;
 CREATE SCHEMA IF NOT EXISTS warehouse;
 
+-- Shadow tables for full reloads (swapped into staging on commit)
+CREATE SCHEMA IF NOT EXISTS staging_load;
+
 -- =====================================================
 -- STAGING: Customers
 -- Purpose: Raw CSV landing table
@@ -67,3 +70,52 @@ CREATE TABLE IF NOT EXISTS staging.transaction_items (
     loaded_at            TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+
+-- =====================================================
+-- STAGING: Load Manifest
+-- Purpose: What each staging table was last loaded from,
+-- so unchanged raw files are skipped and extended ones appended
+-- =====================================================
+CREATE TABLE IF NOT EXISTS staging.load_manifest (
+    table_name     VARCHAR(100) PRIMARY KEY,
+    source_file    VARCHAR(255) NOT NULL,
+    file_size      BIGINT NOT NULL,
+    file_mtime     TIMESTAMP NOT NULL,
+    content_hash   CHAR(64),
+    row_count      BIGINT NOT NULL,
+    loaded_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =====================================================
+-- STAGING: Load Checkpoints
+-- Purpose: Chunks of a resumable (--chunked) load already
+-- committed to the shadow table in staging_load
+-- =====================================================
+CREATE TABLE IF NOT EXISTS staging.load_checkpoints (
+    table_name     VARCHAR(100) NOT NULL,
+    chunk_index    INTEGER NOT NULL,
+    source_file    VARCHAR(255) NOT NULL,
+    file_size      BIGINT NOT NULL,
+    file_mtime     TIMESTAMP NOT NULL,
+    range_start    BIGINT NOT NULL,
+    range_end      BIGINT NOT NULL,
+    row_count      BIGINT NOT NULL,
+    committed_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (table_name, chunk_index)
+);
+
+-- =====================================================
+-- STAGING: Rejected Rows
+-- Purpose: Quarantine for raw rows COPY refused under
+-- --reject-bad-rows (source_offset is the line's byte
+-- offset in a CSV, or its row number in a Parquet file)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS staging.rejected_rows (
+    reject_id      BIGSERIAL PRIMARY KEY,
+    table_name     VARCHAR(100) NOT NULL,
+    source_file    VARCHAR(255) NOT NULL,
+    source_offset  BIGINT NOT NULL,
+    raw_line       TEXT,
+    error_message  TEXT,
+    rejected_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
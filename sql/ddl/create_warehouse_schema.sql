@@ -21,7 +21,7 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_date (
 -- =========================
 CREATE TABLE IF NOT EXISTS warehouse.dim_payment_method (
     payment_method_key SERIAL PRIMARY KEY,
-    payment_method_name VARCHAR(50),
+    payment_method_name VARCHAR(50) UNIQUE,
     payment_type VARCHAR(20)
 );
 
@@ -39,6 +39,7 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_customers (
     age_group VARCHAR(20),
     customer_segment VARCHAR(20),
     registration_date DATE,
+    row_hash CHAR(32),
     effective_date DATE,
     end_date DATE,
     is_current BOOLEAN
@@ -55,6 +56,7 @@ CREATE TABLE IF NOT EXISTS warehouse.dim_products (
     sub_category VARCHAR(60),
     brand VARCHAR(100),
     price_range VARCHAR(20),
+    row_hash CHAR(32),
     effective_date DATE,
     end_date DATE,
     is_current BOOLEAN
@@ -70,6 +72,7 @@ CREATE TABLE IF NOT EXISTS warehouse.fact_sales (
     product_key INT REFERENCES warehouse.dim_products(product_key),
     payment_method_key INT REFERENCES warehouse.dim_payment_method(payment_method_key),
     transaction_id VARCHAR(20),
+    item_id VARCHAR(20),
     quantity INT,
     unit_price DECIMAL(12,2),
     discount_amount DECIMAL(12,2),
@@ -78,6 +81,25 @@ CREATE TABLE IF NOT EXISTS warehouse.fact_sales (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Incremental loads append each production item once (existing databases get the column here)
+ALTER TABLE warehouse.fact_sales ADD COLUMN IF NOT EXISTS item_id VARCHAR(20);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_fact_sales_item
+    ON warehouse.fact_sales (item_id);
+
+-- One current version per member; used by the dimension loads and fact key lookups
+CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_customers_current
+    ON warehouse.dim_customers (customer_id) WHERE is_current;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_dim_products_current
+    ON warehouse.dim_products (product_id) WHERE is_current;
+
+-- SCD Type 2: hash of the tracked attributes, and version lookup by transaction date
+ALTER TABLE warehouse.dim_customers ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+ALTER TABLE warehouse.dim_products ADD COLUMN IF NOT EXISTS row_hash CHAR(32);
+CREATE INDEX IF NOT EXISTS idx_dim_customers_versions
+    ON warehouse.dim_customers (customer_id, effective_date);
+CREATE INDEX IF NOT EXISTS idx_dim_products_versions
+    ON warehouse.dim_products (product_id, effective_date);
+
 -- =========================
 -- AGG TABLES
 -- =========================
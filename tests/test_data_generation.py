@@ -24,3 +24,114 @@ def test_line_total_calculation():
     sample = df.iloc[0]
     expected = sample["quantity"] * sample["unit_price"] * (1 - sample["discount_percentage"] / 100)
     assert round(expected, 2) == round(sample["line_total"], 2)
+
+def test_vectorized_batch_totals_and_integrity():
+    from scripts.data_generation import generate_data as gd
+
+    customers = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
+    products = pd.read_csv(os.path.join(RAW_DIR, "products.csv"))
+    txns, items = gd.generate_transaction_batch(customers, products, 200)
+
+    assert list(txns.columns) == [
+        "transaction_id", "customer_id", "transaction_date", "transaction_time",
+        "payment_method", "shipping_address", "total_amount"
+    ]
+    sums = items.groupby("transaction_id")["line_total"].sum().round(2)
+    assert (txns.set_index("transaction_id")["total_amount"] - sums).abs().max() < 0.01
+    validation = gd.validate_referential_integrity(customers, products, txns, items)
+    assert validation["data_quality_score"] == 100
+
+def test_streaming_generation_continues_ids_across_chunks(tmp_path, monkeypatch):
+    from scripts.data_generation import generate_data as gd
+
+    customers = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
+    products = pd.read_csv(os.path.join(RAW_DIR, "products.csv"))
+    monkeypatch.setattr(gd, "DATA_RAW_DIR", str(tmp_path))
+    monkeypatch.setitem(gd.config["data_generation"], "transactions", 250)
+
+    num_txns, num_items, validation = gd.generate_transactions_streaming(
+        customers, products, chunk_size=100
+    )
+
+    txns = pd.read_csv(tmp_path / "transactions.csv")
+    items = pd.read_csv(tmp_path / "transaction_items.csv")
+    assert num_txns == len(txns) == 250
+    assert num_items == len(items)
+    assert txns["transaction_id"].is_unique and items["item_id"].is_unique
+    assert validation["data_quality_score"] == 100
+
+def test_sharded_generation_is_deterministic(tmp_path, monkeypatch):
+    from scripts.data_generation import generate_data as gd
+
+    customers = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
+    products = pd.read_csv(os.path.join(RAW_DIR, "products.csv"))
+    monkeypatch.setattr(gd, "DATA_RAW_DIR", str(tmp_path))
+    monkeypatch.setitem(gd.config["data_generation"], "transactions", 300)
+
+    outputs = []
+    for _ in range(2):
+        gd.generate_transactions_sharded(customers, products, seed=gd.SEED, workers=3, chunk_size=50)
+        outputs.append((tmp_path / "transaction_items.csv").read_bytes())
+
+    items = pd.read_csv(tmp_path / "transaction_items.csv")
+    assert outputs[0] == outputs[1]
+    assert items["item_id"].is_unique
+    assert pd.read_csv(tmp_path / "transactions.csv")["transaction_id"].nunique() == 300
+
+def test_customer_emails_unique_and_lowercase():
+    df = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
+    assert df["email"].is_unique
+    assert (df["email"] == df["email"].str.lower()).all()
+
+def test_parquet_output_is_typed(tmp_path, monkeypatch):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from scripts.data_generation import generate_data as gd
+
+    customers = pd.read_csv(os.path.join(RAW_DIR, "customers.csv"))
+    products = pd.read_csv(os.path.join(RAW_DIR, "products.csv"))
+    monkeypatch.setattr(gd, "DATA_RAW_DIR", str(tmp_path))
+    monkeypatch.setitem(gd.config["data_generation"], "transactions", 120)
+    monkeypatch.setitem(gd.config["raw_data"], "parquet_row_group_size", 50)
+
+    gd.generate_transactions_streaming(customers, products, chunk_size=60, fmt="parquet")
+
+    parquet_file = pq.ParquetFile(tmp_path / "transactions.parquet")
+    assert parquet_file.metadata.num_rows == 120
+    assert parquet_file.num_row_groups == 4
+    assert parquet_file.schema_arrow.field("transaction_date").type == pa.date32()
+
+def test_scale_factor_scales_counts_and_history(monkeypatch):
+    import copy
+    from scripts.data_generation import generate_data as gd
+
+    monkeypatch.setattr(gd, "config", copy.deepcopy(gd.config))
+    profile = gd.apply_scale_factor("SF10")
+
+    gen = gd.config["data_generation"]
+    assert gen["transactions"] == profile["transactions"] == 100000
+    assert gen["start_date"] == "2023-01-01" and gen["end_date"] == "2024-12-31"
+
+def test_delta_continues_counters(tmp_path, monkeypatch):
+    import copy
+    import shutil
+    from argparse import Namespace
+    from scripts.data_generation import generate_data as gd
+
+    for name in ["customers.csv", "products.csv", "transactions.csv",
+                 "transaction_items.csv", "generation_metadata.json"]:
+        shutil.copy(os.path.join(RAW_DIR, name), tmp_path / name)
+    monkeypatch.setattr(gd, "DATA_RAW_DIR", str(tmp_path))
+    monkeypatch.setattr(gd, "config", copy.deepcopy(gd.config))
+    before = gd.load_generation_metadata()
+
+    args = Namespace(format="csv", seed=gd.SEED, delta_days=1, delta_transactions=20,
+                     new_customers=3, new_products=2, change_fraction=0.05)
+    metadata = gd.generate_delta(args, chunk_size=10)
+
+    txns = pd.read_csv(tmp_path / "transactions.csv")
+    customers = pd.read_csv(tmp_path / "customers.csv")
+    assert txns["transaction_id"].is_unique and customers["customer_id"].is_unique
+    assert len(txns) == before["record_counts"]["transactions"] + 20
+    assert metadata["id_counters"]["next_customer"] == before["id_counters"]["next_customer"] + 3
+    assert txns["transaction_date"].iloc[-1] > before["date_range"]["end"]
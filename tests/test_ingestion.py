@@ -22,3 +22,209 @@ def test_staging_tables_exist():
     expected = {"customers", "products", "transactions", "transaction_items"}
     assert expected.issubset(tables)
     conn.close()
+
+def test_source_ranges_cover_file_on_line_boundaries():
+    from scripts.ingestion import ingest_to_staging as ing
+
+    path = os.path.join(ing.RAW_DATA_DIR, "transaction_items.csv")
+    ranges = ing.plan_source_ranges(path, 4)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    header_end = content.index(b"\n") + 1
+    assert len(ranges) == 4
+    assert ranges[0][0] == header_end and ranges[-1][1] == len(content)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and content[start - 1:start] == b"\n"
+
+def test_counting_reader_single_pass_stats():
+    import hashlib
+    import io
+    from scripts.ingestion import ingest_to_staging as ing
+
+    content = b"id,name\n1,a\n2,b\n3,c"
+    reader = ing.CountingReader(io.BytesIO(content))
+    reader.skip_header()
+    while reader.read(4):
+        pass
+
+    stats = reader.stats()
+    assert stats["rows"] == 3
+    assert stats["bytes"] == len(content)
+    assert stats["content_hash"] == hashlib.sha256(content).hexdigest()
+
+def test_manifest_plans_skip_append_and_full(tmp_path):
+    import hashlib
+    from scripts.ingestion import ingest_to_staging as ing
+
+    path = tmp_path / "transactions.csv"
+    path.write_bytes(b"id,amount\n1,10\n2,20\n")
+    info = ing.file_info(str(path))
+    entry = {
+        "source_file": "transactions.csv", "file_size": info["size"], "file_mtime": info["mtime"],
+        "content_hash": hashlib.sha256(path.read_bytes()).hexdigest(), "row_count": 2
+    }
+    assert ing.plan_table_load(entry, str(path))["load_type"] == "skipped"
+    assert ing.plan_table_load(entry, str(path), full_reload=True)["load_type"] == "full"
+
+    path.write_bytes(b"id,amount\n1,10\n2,20\n3,30\n")
+    plan = ing.plan_table_load(entry, str(path))
+    assert plan["load_type"] == "append" and plan["append_from"][0] == entry["file_size"]
+    plan["append_from"][1].update(b"3,30\n")
+    assert plan["append_from"][1].hexdigest() == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    path.write_bytes(b"id,amount\n1,99\n2,20\n3,30\n")
+    assert ing.plan_table_load(entry, str(path))["load_type"] == "full"
+
+def test_bulk_mode_captures_primary_keys():
+    from scripts.ingestion import ingest_to_staging as ing
+
+    conn = get_conn()
+    cur = conn.cursor()
+    definitions = ing.index_definitions(cur, "staging.customers")
+    assert ("constraint", "customers_pkey", "PRIMARY KEY (customer_id)") in definitions
+    conn.close()
+
+def test_binary_copy_encoding():
+    import datetime
+    import decimal
+    import pyarrow as pa
+    from scripts.ingestion import ingest_to_staging as ing
+
+    batch = pa.record_batch([
+        pa.array([1, None], pa.int32()),
+        pa.array(["ab", "c"]),
+        pa.array([decimal.Decimal("12.50"), decimal.Decimal("-0.05")], pa.decimal128(5, 2)),
+        pa.array([datetime.date(2000, 1, 2), None]),
+    ], names=["q", "s", "n", "d"])
+    types = {
+        "q": ("integer", 32, 0), "s": ("character varying", None, None),
+        "n": ("numeric", 5, 2), "d": ("date", None, None)
+    }
+
+    assert ing.encode_binary_rows(batch, types) == bytes.fromhex(
+        "0004" "00000004" "00000001" "00000002" "6162"
+        "0000000c" "0002" "0000" "0000" "0002" "000c" "1388" "00000004" "00000001"
+        "0004" "ffffffff" "00000001" "63"
+        "0000000c" "0002" "0000" "4000" "0002" "0000" "01f4" "ffffffff"
+    )
+
+def test_compressed_sources_stream_rows_and_stored_hash(tmp_path):
+    import gzip
+    import hashlib
+    import pytest
+    from scripts.ingestion import ingest_to_staging as ing
+
+    content = b"id,name\n1,a\n2,b\n3,c\n"
+    zstandard = pytest.importorskip("zstandard")
+    archives = {
+        "feed.csv.gz": gzip.compress(content),
+        "feed.csv.zst": zstandard.ZstdCompressor().compress(content),
+    }
+
+    for name, stored in archives.items():
+        path = tmp_path / name
+        path.write_bytes(stored)
+        with ing.open_csv_source(str(path)) as reader:
+            assert reader.read() == b"1,a\n2,b\n3,c\n"
+
+        stats = reader.stats()
+        assert stats["rows"] == 3
+        assert stats["bytes"] == len(stored)
+        assert stats["content_hash"] == hashlib.sha256(stored).hexdigest()
+
+def test_chunked_load_resumes_after_failure(monkeypatch):
+    import pytest
+    from scripts.ingestion import ingest_to_staging as ing
+
+    table = "staging.products"
+    path = ing.resolve_sources()[table]
+    plan = {**ing.plan_table_load(None, path), "copy_options": {}}
+    monkeypatch.setitem(ing.INGESTION_CONFIG, "chunk_mb", 0.01)
+    assert len(ing.plan_chunk_ranges(path)) > 2
+
+    conn = get_conn()
+    cur = conn.cursor()
+    copy = ing.copy_file_to_table
+    calls = []
+
+    def fail_on_third_chunk(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 3:
+            raise RuntimeError("simulated failure")
+        return copy(*args, **kwargs)
+
+    try:
+        monkeypatch.setattr(ing, "copy_file_to_table", fail_on_third_chunk)
+        with pytest.raises(RuntimeError):
+            ing.load_table_chunks(conn, cur, table, plan)
+        conn.rollback()
+
+        monkeypatch.setattr(ing, "copy_file_to_table", copy)
+        stats = ing.load_table_chunks(conn, cur, table, plan)
+        assert stats["resumed_chunks"] == 2
+
+        cur.execute(f"SELECT COUNT(*), COUNT(DISTINCT product_id) FROM {ing.shadow_table(table)}")
+        assert cur.fetchone() == (stats["rows"], stats["rows"])
+        assert stats["rows"] == sum(1 for _ in open(path)) - 1
+    finally:
+        conn.rollback()
+        ing.clear_checkpoints(cur, table)
+        ing.drop_shadow_table(cur, table)
+        conn.commit()
+        conn.close()
+
+def test_serial_reload_keeps_staging_readable(monkeypatch):
+    import threading
+    from scripts.ingestion import ingest_to_staging as ing
+
+    monkeypatch.setitem(ing.DB_CONFIG, "port", int(os.getenv("DB_PORT", 5432)))
+    copying = threading.Event()
+    release = threading.Event()
+    copy = ing.copy_file_to_table
+
+    def paused_copy(*args, **kwargs):
+        stats = copy(*args, **kwargs)
+        if args[1] == "staging.transactions":
+            copying.set()
+            release.wait(10)
+        return stats
+
+    monkeypatch.setattr(ing, "copy_file_to_table", paused_copy)
+    summary = {"tables_loaded": {}}
+    loader = threading.Thread(target=ing.load_serial, args=(summary,), kwargs={"full_reload": True})
+    loader.start()
+
+    conn = get_conn()
+    try:
+        assert copying.wait(10)
+        cur = conn.cursor()
+        cur.execute("SET lock_timeout = '1s'")
+        cur.execute("SELECT COUNT(*) FROM staging.transactions")
+        assert cur.fetchone()[0] > 0
+    finally:
+        conn.close()  # an open read transaction would hold up the swap
+        release.set()
+        loader.join()
+
+    assert summary["tables_loaded"]["staging.transactions"]["status"] == "success"
+
+def test_bisecting_copy_isolates_bad_rows():
+    from scripts.ingestion import ingest_to_staging as ing
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("CREATE TEMP TABLE bisect_items (LIKE staging.transaction_items INCLUDING ALL)")
+
+    lines = [f"ITEM{i},TXN1,PROD1,1,10.00,0.00,10.00\n".encode() for i in range(16)]
+    lines[5] = b"ITEM5,TXN1,PROD1,one,10.00,0.00,10.00\n"
+    lines[11] = b"ITEM3,TXN1,PROD1,1,10.00,0.00,10.00\n"  # duplicate key
+
+    statement = ing.copy_statement("staging.transaction_items", "pg_temp.bisect_items")
+    rejected = ing.copy_lines_bisecting(cur, statement, lines)
+
+    assert [index for index, _ in rejected] == [5, 11]
+    assert "integer" in rejected[0][1] and "duplicate key" in rejected[1][1]
+    cur.execute("SELECT COUNT(*) FROM bisect_items")
+    assert cur.fetchone()[0] == 14
+    conn.close()
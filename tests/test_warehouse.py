@@ -27,3 +27,126 @@ def test_surrogate_keys_used():
     """)
     assert cur.fetchone()[0] is not None
     conn.close()
+
+def test_dim_date_covers_transactions_with_python_calendar():
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT COUNT(*) FROM production.transactions t
+        LEFT JOIN warehouse.dim_date d ON d.full_date = t.transaction_date
+        WHERE d.date_key IS NULL
+    """)
+    assert cur.fetchone()[0] == 0
+
+    cur.execute("""
+        SELECT date_key, full_date, year, quarter, month, day,
+               month_name, day_name, week_of_year, is_weekend
+        FROM warehouse.dim_date
+    """)
+    for row in cur.fetchall():
+        d = row[1]
+        assert row == (
+            int(d.strftime("%Y%m%d")), d, d.year, (d.month - 1) // 3 + 1, d.month, d.day,
+            d.strftime("%B"), d.strftime("%A"), int(d.strftime("%W")), d.weekday() >= 5
+        )
+    conn.close()
+
+def test_incremental_fact_load_appends_new_items_only():
+    from scripts.transformation import load_warehouse as lw
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT COUNT(*), MAX(sales_key) FROM warehouse.fact_sales")
+    facts, last_key = cur.fetchone()
+    cur.execute("""
+        INSERT INTO production.transactions
+        (transaction_id, customer_id, transaction_date, transaction_time,
+         payment_method, shipping_address, total_amount)
+        SELECT 'TXNTEST01', customer_id, transaction_date, transaction_time,
+               payment_method, shipping_address, 10.00
+        FROM production.transactions ORDER BY transaction_id LIMIT 1
+        RETURNING TO_CHAR(transaction_date, 'YYYYMMDD')::INT
+    """)
+    date_key = cur.fetchone()[0]
+    cur.execute("""
+        INSERT INTO production.transaction_items
+        (item_id, transaction_id, product_id, quantity, unit_price, discount_percentage, line_total)
+        SELECT 'ITEMTEST01', 'TXNTEST01', product_id, 1, 10.00, 0, 10.00
+        FROM production.products ORDER BY product_id LIMIT 1
+    """)
+    conn.commit()
+
+    try:
+        lw.main([])
+        # Existing facts keep their keys; only the new item was appended
+        cur.execute("SELECT COUNT(*), MAX(sales_key) FROM warehouse.fact_sales WHERE item_id <> 'ITEMTEST01'")
+        assert cur.fetchone() == (facts, last_key)
+        cur.execute("SELECT COUNT(*), MIN(sales_key) FROM warehouse.fact_sales WHERE item_id = 'ITEMTEST01'")
+        count, new_key = cur.fetchone()
+        assert count == 1 and new_key > last_key
+
+        cur.execute("""
+            SELECT a.total_revenue = f.revenue
+            FROM warehouse.agg_daily_sales a,
+                 (SELECT SUM(line_total) AS revenue FROM warehouse.fact_sales WHERE date_key = %s) f
+            WHERE a.date_key = %s
+        """, (date_key, date_key))
+        assert cur.fetchone()[0]
+    finally:
+        conn.rollback()
+        cur.execute("DELETE FROM warehouse.fact_sales WHERE item_id = 'ITEMTEST01'")
+        cur.execute("DELETE FROM production.transaction_items WHERE item_id = 'ITEMTEST01'")
+        cur.execute("DELETE FROM production.transactions WHERE transaction_id = 'TXNTEST01'")
+        lw.refresh_daily_sales(cur, [date_key])
+        conn.commit()
+        conn.close()
+
+def test_scd2_merge_versions_changed_members_only():
+    import datetime
+    from scripts.transformation import load_warehouse as lw
+
+    conn = get_conn()
+    cur = conn.cursor()
+    cur.execute("SELECT customer_id, city FROM production.customers ORDER BY customer_id LIMIT 1")
+    customer_id, city = cur.fetchone()
+    cur.execute("SELECT customer_key FROM warehouse.dim_customers WHERE customer_id = %s AND is_current", (customer_id,))
+    old_key = cur.fetchone()[0]
+    cur.execute("SELECT COUNT(*) FROM warehouse.dim_customers")
+    versions = cur.fetchone()[0]
+
+    cur.execute("UPDATE production.customers SET city = 'Versioned' WHERE customer_id = %s", (customer_id,))
+    conn.commit()
+    try:
+        lw.main([])
+        today = datetime.date.today()
+
+        cur.execute("""
+            SELECT customer_key, city, effective_date, end_date, is_current
+            FROM warehouse.dim_customers WHERE customer_id = %s ORDER BY customer_key
+        """, (customer_id,))
+        old, new = cur.fetchall()[-2:]
+        assert old[0] == old_key and old[3] == today - datetime.timedelta(days=1) and not old[4]
+        assert new[1:] == ("Versioned", today, None, True)
+
+        # Only the changed member gained a version, and existing facts keep the old key
+        cur.execute("SELECT COUNT(*) FROM warehouse.dim_customers")
+        assert cur.fetchone()[0] == versions + 1
+        cur.execute("""
+            SELECT COUNT(*) FROM warehouse.fact_sales f
+            JOIN warehouse.dim_customers dc ON dc.customer_key = f.customer_key
+            WHERE dc.customer_id = %s AND dc.customer_key <> %s
+        """, (customer_id, old_key))
+        assert cur.fetchone()[0] == 0
+    finally:
+        conn.rollback()
+        cur.execute("UPDATE production.customers SET city = %s WHERE customer_id = %s", (city, customer_id))
+        cur.execute("""
+            DELETE FROM warehouse.dim_customers
+            WHERE customer_id = %s AND customer_key > %s
+        """, (customer_id, old_key))
+        cur.execute("""
+            UPDATE warehouse.dim_customers SET end_date = NULL, is_current = TRUE
+            WHERE customer_key = %s
+        """, (old_key,))
+        conn.commit()
+        conn.close()